@@ -259,6 +259,208 @@ print(Search_id(usuarios, 7))
 print(Search_id_dict(usuarios, 10))
 print(Binary_search(usuarios, 22))
 
+# Versión 4: índice persistente. Search_id_dict reconstruye el dict en CADA búsqueda (O(n) por búsqueda);
+# UserIndex lo construye una sola vez y lo mantiene al día en cada alta, cambio o baja: búsquedas O(1).
+class UserIndex:
+    """Índices por id, por email y por activo sobre los mismos dicts de usuario (no los copia)."""
+    def __init__(self, users : list = ()):
+        self.by_id = {}
+        self.by_email = {}
+        self.by_active = {True: {}, False: {}}  # activo -> {id: usuario}; el dict conserva el orden de inserción
+        self.version = 0  # cambia en cada alta, cambio o baja: las vistas derivadas (SortedView) saben cuándo rehacerse
+        for user in users:
+            self.insert(user)
+
+    def __len__(self) -> int:
+        return len(self.by_id)
+
+    def __contains__(self, user_id : int) -> bool:
+        return user_id in self.by_id
+
+    def __iter__(self):
+        return iter(self.by_id.values())
+
+    def get(self, user_id : int) -> dict | None:
+        return self.by_id.get(user_id)
+
+    def get_by_email(self, email : str) -> dict | None:
+        return self.by_email.get(email)
+
+    def filter_active(self, activo : bool = True) -> list[dict]:
+        return list(self.by_active[bool(activo)].values())
+
+    def insert(self, user : dict) -> str | None:
+        if user["id"] in self.by_id:
+            return f"user id {user['id']} already exists"
+        if user["email"] in self.by_email:
+            return f"email {user['email']} already exists"
+        self.by_id[user["id"]] = user
+        self.by_email[user["email"]] = user
+        self.by_active[bool(user["activo"])][user["id"]] = user
+        self.version += 1
+        return None
+
+    def update(self, user_id : int, **changes) -> dict | str:
+        """Modifica el usuario en su lugar y actualiza solo los índices de los campos que cambian."""
+        user = self.by_id.get(user_id)
+        if user is None:
+            return f"user id {user_id} not found"
+        if "id" in changes and changes["id"] != user_id:
+            return "id cannot be changed, delete and insert the user instead"
+        email = changes.get("email", user["email"])
+        if email != user["email"]:
+            if email in self.by_email:
+                return f"email {email} already exists"
+            del self.by_email[user["email"]]
+            self.by_email[email] = user
+        activo = bool(changes.get("activo", user["activo"]))
+        if activo != bool(user["activo"]):
+            del self.by_active[not activo][user_id]
+            self.by_active[activo][user_id] = user
+        user.update(changes)
+        self.version += 1
+        return user
+
+    def delete(self, user_id : int) -> dict | str:
+        user = self.by_id.pop(user_id, None)
+        if user is None:
+            return f"user id {user_id} not found"
+        del self.by_email[user["email"]]
+        del self.by_active[bool(user["activo"])][user_id]
+        self.version += 1
+        return user
+
+def benchmark_user_index(sizes : tuple = (10_000, 1_000_000, 10_000_000), lookups : int = 1_000, slow_lookups : int = 3):
+    """Latencia por búsqueda: Search_id (lineal) y Search_id_dict (reconstruye el dict) vs UserIndex ya construido.
+    Las versiones O(n) se miden con pocas búsquedas (slow_lookups) porque a 10M cada una tarda segundos."""
+    import time
+    import random
+    for n in sizes:
+        users = [
+            {"id": i, "nombre": f"Usuario{i}", "email": f"user{i}@email.com", "activo": i % 2 == 0}
+            for i in range(n)
+        ]
+        ids = [random.randrange(n) for _ in range(lookups)]
+        start_time = time.perf_counter()
+        index = UserIndex(users)
+        build = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        by_index = [index.get(user_id) for user_id in ids]
+        by_email = [index.get_by_email(f"user{user_id}@email.com") for user_id in ids]
+        time_index = (time.perf_counter() - start_time) / (2 * lookups)
+
+        start_time = time.perf_counter()
+        linear = [Search_id(users, user_id) for user_id in ids[:slow_lookups]]
+        time_linear = (time.perf_counter() - start_time) / slow_lookups
+
+        start_time = time.perf_counter()
+        rebuilt = [Search_id_dict(users, user_id) for user_id in ids[:slow_lookups]]
+        time_rebuilt = (time.perf_counter() - start_time) / slow_lookups
+
+        assert by_index == by_email and rebuilt == by_index[:slow_lookups], "UserIndex no coincide con Search_id_dict"
+        assert [user["id"] for user in linear] == ids[:slow_lookups], "UserIndex no coincide con Search_id"
+        print(f"n={n} | Search_id: {time_linear * 1e6:,.1f} µs | Search_id_dict: {time_rebuilt * 1e6:,.1f} µs | "
+              f"UserIndex: {time_index * 1e6:,.3f} µs (construcción única {build:.2f}s)")
+
+usuarios_index = UserIndex(usuarios)
+print(usuarios_index.get(10) is Search_id_dict(usuarios, 10), usuarios_index.get_by_email("user7@email.com")["id"])
+print(len(usuarios_index.filter_active()), len(usuarios_index.filter_active(False)))
+print(usuarios_index.insert({"id": 10000, "nombre": "Nuevo", "email": "nuevo@email.com", "activo": True}),
+      usuarios_index.update(10000, activo=False)["activo"], usuarios_index.delete(10000)["nombre"], len(usuarios_index))
+benchmark_user_index((10_000,), 1_000, 10)
+
+# Binary_search ordena la lista en CADA llamada: O(n log n) por una búsqueda "O(log n)".
+# SortedView ordena una vez por su función key y guarda la columna de claves como lista plana para bisect;
+# solo vuelve a ordenar cuando la fuente cambia: por su version si es un UserIndex, por su largo si es una lista
+# (los cambios in-place de una lista no se detectan: llamar invalidate()).
+# Una vista = una key = una copia ordenada: para buscar por otro campo se crea otra vista.
+# bisect se importa aquí y no en cada find (se llama una vez por búsqueda).
+from bisect import bisect_left, bisect_right
+
+class SortedView:
+    def __init__(self, source, key=lambda x: x["id"]):
+        self.source = source
+        self.key = key
+        self.cache = None  # (estado, filas, claves) de la última vez que se ordenó
+
+    def _state(self) -> tuple:
+        return (getattr(self.source, "version", None), len(self.source))
+
+    def invalidate(self) -> None:
+        self.cache = None
+
+    def _sorted(self) -> tuple[list, list]:
+        state = self._state()
+        if self.cache is None or self.cache[0] != state:
+            rows = sorted(self.source, key=self.key)
+            self.cache = (state, rows, [self.key(row) for row in rows])
+        return self.cache[1], self.cache[2]
+
+    def find(self, value) -> dict | None:
+        """Como Binary_search: O(log n) sobre las claves ya ordenadas."""
+        rows, keys = self._sorted()
+        position = bisect_left(keys, value)
+        return rows[position] if position < len(keys) and keys[position] == value else None
+
+    def find_many(self, values : list) -> list:
+        """Resuelve muchas claves en un solo recorrido: se ordenan las consultas y cada búsqueda empieza donde
+        terminó la anterior. Retorna las filas (o None) en el orden de values."""
+        rows, keys = self._sorted()
+        result = [None] * len(values)
+        position = 0
+        for i in sorted(range(len(values)), key=values.__getitem__):
+            position = bisect_left(keys, values[i], position)
+            if position < len(keys) and keys[position] == values[i]:
+                result[i] = rows[position]
+        return result
+
+    def range(self, low, high) -> list:
+        """Filas con low <= clave <= high, en orden de clave."""
+        rows, keys = self._sorted()
+        return rows[bisect_left(keys, low):bisect_right(keys, high)]
+
+def benchmark_sorted_view(n : int = 1_000_000, lookups : int = 1_000, slow_lookups : int = 3):
+    import time
+    import random
+    users = [
+        {"id": i, "nombre": f"Usuario{i}", "email": f"user{i}@email.com", "activo": i % 2 == 0}
+        for i in range(n)
+    ]
+    random.shuffle(users)
+    ids = [random.randrange(n) for _ in range(lookups)]
+
+    start_time = time.perf_counter()
+    slow = [Binary_search(users, user_id) for user_id in ids[:slow_lookups]]
+    time_slow = (time.perf_counter() - start_time) / slow_lookups
+
+    view = SortedView(users)
+    start_time = time.perf_counter()
+    view.find(ids[0])
+    time_sort = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    single = [view.find(user_id) for user_id in ids]
+    time_single = (time.perf_counter() - start_time) / lookups
+
+    start_time = time.perf_counter()
+    batch = view.find_many(ids)
+    time_batch = (time.perf_counter() - start_time) / lookups
+
+    assert single == batch and slow == single[:slow_lookups], "SortedView no coincide con Binary_search"
+    print(f"n={n} | Binary_search: {time_slow * 1e6:,.0f} µs | SortedView.find: {time_single * 1e6:.2f} µs | "
+          f"find_many: {time_batch * 1e6:.2f} µs por clave (orden inicial {time_sort:.2f}s)")
+
+usuarios_ordenados = SortedView(usuarios_index)
+print(usuarios_ordenados.find(22) is Binary_search(usuarios, 22), [user["id"] for user in usuarios_ordenados.range(20, 24)])
+print([user and user["id"] for user in usuarios_ordenados.find_many([9_999, 3, 123_456, 50])])
+usuarios_por_email = SortedView(usuarios_index, key=lambda x: x["email"])
+print(usuarios_por_email.find("user7@email.com")["id"])
+usuarios_index.delete(3)
+print(usuarios_ordenados.find(3), usuarios_ordenados.find(4)["id"])  # la baja invalida la vista
+usuarios_index.insert(usuarios[3])
+benchmark_sorted_view(10_000, 1_000, 10)
+
 # Ejercicio 3: N+1 Problem Simulado
 # Contexto: Simular problema N+1 común en ORMs como Django.
 # Requisitos: Simula una base de datos en memoria:
@@ -316,6 +518,81 @@ def Obtain_products_category(prod : list[dict]) -> dict | str:
         queries += 1  # Simula query por cada producto, pero sin acceder a la base de datos
         resultado.append({"Product": products["nombre"], "Category": categoria_nombre})
     return {"Products with category": resultado, "Amount of queries": queries}
+
+# Versión 3 (DataLoader): como el DataLoader de GraphQL. Durante una pasada solo se ANOTAN los categoria_id pedidos
+# (load); al pedir el primer valor se hace UNA query con todos los ids pendientes y los resultados quedan en caché
+# por el resto del request. El loader cuenta sus queries para poder verificar que fue exactamente una.
+def fetch_categories(ids : list[int]) -> dict[int, dict]:
+    """Una "query" en lote: SELECT * FROM categorias WHERE id IN (...)."""
+    import time
+    time.sleep(0.0001)  # Simula el costo de ir a la base de datos
+    return {cat_id: categorias_db[cat_id] for cat_id in ids if cat_id in categorias_db}
+
+class Deferred:
+    """Resultado pendiente de un BatchLoader: get() dispara el lote si la clave todavía no se cargó."""
+    def __init__(self, loader, key):
+        self.loader = loader
+        self.key = key
+
+    def get(self):
+        loader = self.loader
+        if self.key not in loader.cache:
+            if self.key not in loader.pending:
+                # clear() borró la caché después de load(): se vuelven a pedir TODAS las claves de los Deferred
+                # vivos que faltan, así siguen saliendo en un solo lote y no una query por get()
+                loader.requeue()
+            loader.dispatch()
+        return loader.cache[self.key]
+
+class BatchLoader:
+    """Un loader por request: la caché vive lo que vive el loader (clear() la reinicia)."""
+    def __init__(self, batch_fetch):
+        import weakref
+        self.batch_fetch = batch_fetch  # recibe una lista de claves y retorna {clave: objeto}
+        self.cache = {}
+        self.pending = {}  # dict como set ordenado: conserva el orden en que se pidieron las claves
+        self.deferred = weakref.WeakSet()  # Deferred que alguien todavía tiene: requeue() los vuelve a pedir
+        self.queries = 0
+
+    def load(self, key) -> Deferred:
+        if key not in self.cache:
+            self.pending[key] = None
+        deferred = Deferred(self, key)
+        self.deferred.add(deferred)
+        return deferred
+
+    def load_many(self, keys) -> list:
+        deferred = [self.load(key) for key in keys]
+        return [item.get() for item in deferred]
+
+    def dispatch(self) -> None:
+        if not self.pending:
+            return
+        keys = list(self.pending)
+        self.pending.clear()
+        found = self.batch_fetch(keys)
+        self.queries += 1
+        for key in keys:
+            self.cache[key] = found.get(key)  # las claves inexistentes quedan en caché como None
+
+    def requeue(self) -> None:
+        """Anota en pending las claves de todos los Deferred vivos que no están en caché."""
+        for deferred in self.deferred:
+            if deferred.key not in self.cache:
+                self.pending[deferred.key] = None
+
+    def clear(self) -> None:
+        """Borra la caché. Las claves pendientes se conservan: todavía hay Deferred esperando ese lote."""
+        self.cache.clear()
+
+def Obtain_products_loader(prod : list[dict], loader : BatchLoader | None = None) -> dict:
+    loader = loader or BatchLoader(fetch_categories)
+    requested = [(products, loader.load(products["categoria_id"])) for products in prod]  # pasada 1: solo anota ids
+    resultado = []
+    for products, categoria in requested:  # pasada 2: el primer get() hace la única query
+        categoria = categoria.get()
+        resultado.append({"Product": products["nombre"], "Category": categoria["nombre"] if categoria else "Desconocida"})
+    return {"Products with category": resultado, "Amount of queries": loader.queries}
 # Crea función comparar_n_plus_one() que:
 #   - Ejecute ambas versiones
 #   - Mida tiempo de ejecución
@@ -342,9 +619,152 @@ def comparar_n_plus_one():
     print("Tiempo Bueno:", time_bueno, "segundos")
     
     print("Diferencia de Performance:", time_bueno - time_malo, "segundos")
+
+    start_time = time.time()
+    result_loader = Obtain_products_loader(productos_db)
+    time_loader = time.time() - start_time
+    assert result_loader["Products with category"] == result_bueno["Products with category"], "El loader no coincide"
+    assert result_loader["Amount of queries"] == 1, "El loader debe hacer una sola query de categorías"
+    print("Queries Loader:", result_loader["Amount of queries"], "para", len(productos_db), "productos")
+    print("Tiempo Loader:", time_loader, "segundos")
     
 comparar_n_plus_one()
 
+# Versión SQLite: las mismas tablas en una base SQLite real (en memoria, compartida entre las conexiones del pool)
+# para medir idas y vueltas de verdad en lugar de un time.sleep. Tres formas de leer productos con su categoría:
+#   - n_plus_one: 1 query de productos + 1 query de categoría POR producto (lo que hace un ORM sin optimizar)
+#   - join: 1 query con JOIN (select_related de Django)
+#   - prefetch: 1 query de productos + 1 query con WHERE id IN (...) para las categorías (prefetch_related)
+# Queda afuera la latencia de red de un servidor de base de datos real: aquí cada query es una llamada en el proceso.
+class QueryStats:
+    """Cantidad de queries, tiempo total e histograma de latencias por estrategia."""
+    buckets_us = (25, 50, 100, 250, 1000)
+
+    def __init__(self):
+        self.queries = {}
+        self.seconds = {}
+        self.histograms = {}
+
+    def record(self, strategy : str, seconds : float) -> None:
+        self.queries[strategy] = self.queries.get(strategy, 0) + 1
+        self.seconds[strategy] = self.seconds.get(strategy, 0.0) + seconds
+        labels = [f"<={bucket}µs" for bucket in self.buckets_us] + [f">{self.buckets_us[-1]}µs"]
+        histogram = self.histograms.setdefault(strategy, dict.fromkeys(labels, 0))
+        micro = seconds * 1e6
+        position = next((i for i, bucket in enumerate(self.buckets_us) if micro <= bucket), len(self.buckets_us))
+        histogram[labels[position]] += 1
+
+    def reset(self) -> None:
+        self.queries.clear()
+        self.seconds.clear()
+        self.histograms.clear()
+
+class ConnectionPool:
+    """Conexiones abiertas una vez y reutilizadas: acquire() toma una libre, release() la devuelve."""
+    def __init__(self, database : str, size : int = 4):
+        import queue
+        import sqlite3
+        if not isinstance(size, int) or size < 1:
+            raise ValueError(f"size must be a positive integer, received: {size}")
+        self.idle = queue.LifoQueue()
+        self.connections = [sqlite3.connect(database, uri=True, check_same_thread=False) for _ in range(size)]
+        for connection in self.connections:
+            self.idle.put(connection)
+
+    def acquire(self):
+        return self.idle.get()
+
+    def release(self, connection) -> None:
+        self.idle.put(connection)
+
+    def close(self) -> None:
+        for connection in self.connections:
+            connection.close()
+
+class SQLiteCatalog:
+    def __init__(self, products : list[dict] | None = None, categories : dict | None = None, pool_size : int = 4,
+                 database : str | None = None):
+        products = productos_db if products is None else products
+        categories = categorias_db if categories is None else categories
+        # una base en memoria con nombre y cache=shared es visible para todas las conexiones del pool
+        self.pool = ConnectionPool(database or f"file:catalogo{id(self)}?mode=memory&cache=shared", pool_size)
+        self.stats = QueryStats()
+        connection = self.pool.acquire()
+        try:
+            connection.executescript("""
+                CREATE TABLE categorias (id INTEGER PRIMARY KEY, nombre TEXT NOT NULL);
+                CREATE TABLE productos (id INTEGER PRIMARY KEY, nombre TEXT NOT NULL, precio REAL,
+                                        categoria_id INTEGER REFERENCES categorias (id));
+                CREATE INDEX productos_categoria ON productos (categoria_id);
+            """)
+            connection.executemany("INSERT INTO categorias (id, nombre) VALUES (?, ?)",
+                                   [(cat["id"], cat["nombre"]) for cat in categories.values()])
+            # productos_db repite ids (la lista se multiplica por 1000): la tabla usa la posición como clave
+            connection.executemany("INSERT INTO productos (nombre, precio, categoria_id) VALUES (?, ?, ?)",
+                                   [(p["nombre"], p["precio"], p["categoria_id"]) for p in products])
+            connection.commit()
+        finally:
+            self.pool.release(connection)
+
+    def _query(self, strategy : str, sql : str, params : tuple = ()) -> list[tuple]:
+        import time
+        connection = self.pool.acquire()
+        try:
+            start_time = time.perf_counter()
+            rows = connection.execute(sql, params).fetchall()
+            self.stats.record(strategy, time.perf_counter() - start_time)
+        finally:
+            self.pool.release(connection)
+        return rows
+
+    def products_n_plus_one(self) -> list[dict]:
+        resultado = []
+        for nombre, categoria_id in self._query("n_plus_one", "SELECT nombre, categoria_id FROM productos ORDER BY id"):
+            categoria = self._query("n_plus_one", "SELECT nombre FROM categorias WHERE id = ?", (categoria_id,))
+            resultado.append({"Product": nombre, "Category": categoria[0][0] if categoria else "Desconocida"})
+        return resultado
+
+    def products_join(self) -> list[dict]:
+        rows = self._query("join", """
+            SELECT p.nombre, COALESCE(c.nombre, 'Desconocida')
+            FROM productos p LEFT JOIN categorias c ON c.id = p.categoria_id
+            ORDER BY p.id
+        """)
+        return [{"Product": nombre, "Category": categoria} for nombre, categoria in rows]
+
+    def products_prefetch(self, chunk : int = 900) -> list[dict]:
+        products = self._query("prefetch", "SELECT nombre, categoria_id FROM productos ORDER BY id")
+        ids = list(dict.fromkeys(categoria_id for _, categoria_id in products))
+        categories = {}
+        for start in range(0, len(ids), chunk):  # SQLite limita la cantidad de parámetros por query
+            part = ids[start:start + chunk]
+            placeholders = ", ".join("?" * len(part))
+            categories.update(self._query("prefetch", f"SELECT id, nombre FROM categorias WHERE id IN ({placeholders})",
+                                          tuple(part)))
+        return [{"Product": nombre, "Category": categories.get(categoria_id, "Desconocida")}
+                for nombre, categoria_id in products]
+
+    def close(self) -> None:
+        self.pool.close()
+
+def benchmark_sqlite_n_plus_one(copies : int = 1000, repetitions : int = 3):
+    """Ejecuta las tres estrategias sobre copies x 5 productos y muestra queries, tiempo e histograma de latencias."""
+    import time
+    products = productos_db[:5] * copies
+    catalog = SQLiteCatalog(products)
+    expected = [{"Product": p["nombre"], "Category": categorias_db[p["categoria_id"]]["nombre"]} for p in products]
+    for strategy in ("n_plus_one", "join", "prefetch"):
+        method = getattr(catalog, f"products_{strategy}")
+        start_time = time.perf_counter()
+        for _ in range(repetitions):
+            assert method() == expected, f"{strategy} no coincide con los datos"
+        elapsed = (time.perf_counter() - start_time) / repetitions
+        print(f"{len(products)} productos | {strategy}: {catalog.stats.queries[strategy] // repetitions} queries, "
+              f"{elapsed * 1000:.1f} ms | latencias: {catalog.stats.histograms[strategy]}")
+    catalog.close()
+
+benchmark_sqlite_n_plus_one()
+
 # Ejercicio 4: Estructuras de Datos y Complejidad
 # Contexto: Elegir la estructura correcta para cada caso.
 # Requisitos: Implementa estas operaciones con diferentes estructuras:
@@ -472,14 +892,15 @@ def found_similar_v1(user_id : int, min_coincidences : int = 2) -> list:
 #   - Usa intersección de sets para contar coincidencias
 #   - Retorna lista de usuarios similares
 
-def found_similar_v2(user_id : int, min_coincidences : int = 2) -> list:
-    user = next((user for user in users_db if user["id"] == user_id), None)
+def found_similar_v2(user_id : int, min_coincidences : int = 2, users : list | None = None) -> list:
+    users = users_db if users is None else users
+    user = next((user for user in users if user["id"] == user_id), None)
     if not user:
         return []
     
     user_interests = set(user["intereses"])
     similars = []
-    for other in users_db:
+    for other in users:
         if other["id"] == user_id:
             continue
         other_interests = set(other["intereses"])
@@ -488,6 +909,36 @@ def found_similar_v2(user_id : int, min_coincidences : int = 2) -> list:
             similars.append(other)
     return similars
 
+# Versión 3 (índice invertido): interés -> posting list con las posiciones de los usuarios que lo tienen.
+# Se construye una vez; una consulta solo toca a los usuarios que comparten al menos un interés
+# y las coincidencias se cuentan sumando las posting lists de los intereses del usuario.
+class InterestIndex:
+    def __init__(self, users : list):
+        from array import array
+        self.users = users
+        self.first_by_id = {}  # como el next() de v2: la primera aparición de cada id
+        self.postings = {}
+        for position, user in enumerate(users):
+            self.first_by_id.setdefault(user["id"], position)
+            for interest in set(user["intereses"]):  # como v2: intereses repetidos cuentan una vez
+                if interest not in self.postings:
+                    self.postings[interest] = array("q")
+                self.postings[interest].append(position)
+
+    def similar(self, user_id : int, min_coincidences : int = 2) -> list:
+        """Mismo resultado que found_similar_v2 (mismo orden, mismos dicts)."""
+        from collections import Counter
+        position = self.first_by_id.get(user_id)
+        if position is None:
+            return []
+        if min_coincidences <= 0:  # con 0 coincidencias alcanza cualquiera: no hay nada que filtrar con el índice
+            return [other for other in self.users if other["id"] != user_id]
+        coincidences = Counter()
+        for interest in set(self.users[position]["intereses"]):
+            coincidences.update(self.postings[interest])
+        positions = sorted(other for other, count in coincidences.items() if count >= min_coincidences)
+        return [self.users[other] for other in positions if self.users[other]["id"] != user_id]
+
 # Crea función benchmark_similares() que:
 #   - Ejecute las 2 versiones buscando similares de 10 usuarios aleatorios
 #   - Mida tiempo promedio de cada versión
@@ -520,6 +971,41 @@ def benchmark():
     
 benchmark()
 
+def benchmark_interest_index(n : int = 1_000_000, interests : int = 200, queries : int = 10, skew : float = 1.1):
+    """v2 vs InterestIndex con n usuarios. La popularidad de los intereses sigue una ley de potencia (Zipf):
+    el interés de rango r aparece con peso 1 / r ** skew, como pasa con las etiquetas reales."""
+    import time
+    import random
+    names = [f"interes{rank}" for rank in range(interests)]
+    weights = [1 / (rank + 1) ** skew for rank in range(interests)]
+    users = [
+        {"id": i, "nombre": f"Usuario{i}", "intereses": list(set(random.choices(names, weights, k=random.randint(3, 8))))}
+        for i in range(n)
+    ]
+    user_ids = random.sample(range(n), queries)
+
+    start_time = time.perf_counter()
+    index = InterestIndex(users)
+    build = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    results_v2 = [found_similar_v2(user_id, users=users) for user_id in user_ids]
+    time_v2 = (time.perf_counter() - start_time) / queries
+
+    start_time = time.perf_counter()
+    results_index = [index.similar(user_id) for user_id in user_ids]
+    time_index = (time.perf_counter() - start_time) / queries
+
+    assert results_v2 == results_index, "InterestIndex no coincide con found_similar_v2"
+    touched = sum(len(result) for result in results_index) / queries
+    print(f"n={n} | v2: {time_v2:.3f}s | InterestIndex: {time_index:.3f}s por consulta "
+          f"(construcción única {build:.2f}s, ~{touched:,.0f} similares por consulta)")
+
+indice_intereses = InterestIndex(users_db)
+print(all(indice_intereses.similar(user_id, minimo) == found_similar_v2(user_id, minimo)
+          for user_id in range(0, 7) for minimo in (0, 1, 2, 3)))
+benchmark_interest_index(20_000, 200, 10)
+
 
 # 📖 Ejercicios de Lectura de Código
 # Ejercicio 6: Identificar Complejidad en Código Real, analiza la complejidad Big O de cada fragmento:
@@ -551,6 +1037,8 @@ def procesar_datos_3(datos):
     return datos[len(datos) // 2]
 # Complejidad: O(1) tiempo constante: accede al elemento de una lista con el indice.
 # O(1) espacio constante: usa variables temporales
+# Alternativa sin ordenar todo: quickselect O(n) promedio (seleccionar_k / mediana en Day-11/Advanced_list.py).
+# En Python puro sorted() (en C) sigue siendo igual de rápido hasta ~1M elementos; quickselect ahorra la copia ordenada.
 
 # Código 4:
 def procesar_datos_4(datos, objetivo):
@@ -59,6 +59,13 @@
 # No considerar que slicing crea copias
 # Copiar listas con = en vez de [:] o copy()
 
+# Imports de los caminos que se ejecutan una vez POR ELEMENTO (por log, por valor): un import dentro de una
+# función se vuelve a resolver en cada llamada (~1.5 µs). Las funciones que se llaman una vez importan adentro.
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from hashlib import blake2b
+
 # Ejemplo práctico - Two Pointers:
 
 def eliminar_duplicados_ordenada(lista):
@@ -172,6 +179,34 @@ def process(transactions : list, opr : str) -> list | None:
     
 print(process(transacciones, "reverse"))
 
+# Fusión de k fuentes ordenadas con un heap: el heap guarda solo el elemento actual de cada fuente (k elementos).
+# Se saca el menor, se emite y se reemplaza por el siguiente de su misma fuente: O(log k) por elemento,
+# memoria O(k) y las fuentes se leen de a un elemento (listas, generadores, archivos...).
+def merge_sorted_sources(*sources, key=None, unique: bool = False):
+    """Genera los elementos de todas las fuentes ordenadas en un solo orden global.
+    key: función para comparar (como en sorted). unique=True omite elementos con la misma clave que el anterior."""
+    import heapq
+    heap = []
+    for number, source in enumerate(sources):
+        iterator = iter(source)
+        for value in iterator:
+            # el número de fuente desempata claves iguales: orden estable y nunca compara los valores
+            heap.append((value if key is None else key(value), number, value, iterator))
+            break
+    heapq.heapify(heap)
+    last_key = None
+    emitted = False
+    while heap:
+        item_key, number, value, iterator = heap[0]
+        if not (unique and emitted and item_key == last_key):
+            yield value
+            last_key, emitted = item_key, True
+        for next_value in iterator:
+            heapq.heapreplace(heap, (next_value if key is None else key(next_value), number, next_value, iterator))
+            break
+        else:  # la fuente se terminó
+            heapq.heappop(heap)
+
 # Ejercicio 2: Two Pointers - Fusión de Listas Ordenadas
 # Contexto: Combinar resultados ordenados de múltiples fuentes.
 # Requisitos: Implementa estas funciones usando técnica de two pointers:
@@ -182,15 +217,8 @@ print(process(transacciones, "reverse"))
 #    - Usa dos punteros (índices) para recorrer ambas listas
 #    - O(n + m) - no uses sort()
 def funsion(list1 : list[int], list2 : list[int]) -> list[int]:
-    list1.extend(list2)
-    if not list1:
-        return 0
-    writer = 1
-    for read in range(1, len(list1)):
-        if list1[read] < list1[read - 1]:
-            list1[writer] = list1[read]
-            writer += 1
-    return list1
+    # las dos listas ya vienen ordenadas: se fusionan sin modificarlas, avanzando siempre por la menor
+    return list(merge_sorted_sources(list1, list2))
 
 # 2. eliminar_duplicados_inplace(lista: list[int]) -> int
 #    - Lista está ordenada
@@ -230,22 +258,146 @@ def move_zeros(list1 : list[int]) -> list[int] | None:
 #    - Usa two pointers: uno al inicio, otro al final
 #    - O(n) - no uses bucles anidados
 
-def find_for_sum(list1 : list[int], obj : int) -> tuple | None:
-    if not list1:
-        return []
-    list1.sort()
-    writer = 1
+def find_for_sum(list1 : list[int], obj : int) -> list[tuple]:
+    # la lista ya viene ordenada: no se ordena ni se modifica
     result = []
-    for read in range(1, len(list1)):
-        if list1[read] + list1[read - 1] == obj:
-            result.append([list1[writer], list1[writer + 1]])
-            writer += 1
+    left, right = 0, len(list1) - 1
+    while left < right:
+        total = list1[left] + list1[right]
+        if total < obj:
+            left += 1
+        elif total > obj:
+            right -= 1
+        else:
+            if not result or result[-1][0] != list1[left]:
+                result.append((list1[left], list1[right]))
+            left += 1
+            right -= 1
     return result
 print(funsion([1, 3, 5], [2, 4, 6]))
 print(delete_duplicades([1, 1, 2, 3, 3, 4]))
 print(move_zeros([0, 1, 0, 3, 12]))
 print(find_for_sum([1, 2, 3, 4, 5], 5))  
 
+def merge_sorted_files(paths: list[str], key=None, unique: bool = False, buffering: int = -1):
+    """Fusiona archivos de texto ordenados (una línea por elemento) leyendo una línea a la vez de cada uno.
+    buffering es el buffer de lectura de cada archivo (como en open): con muchos archivos abiertos pesa."""
+    from contextlib import ExitStack
+    with ExitStack() as stack:
+        files = [stack.enter_context(open(path, encoding="utf-8", buffering=buffering)) for path in paths]
+        lines = [(line.rstrip("\n") for line in file) for file in files]
+        yield from merge_sorted_sources(*lines, key=key, unique=unique)
+
+def benchmark_kway_merge(sources: int = 32, per_source: int = 100_000) -> None:
+    import random
+    import time
+    from itertools import chain
+    data = [sorted(random.randint(0, 10**9) for _ in range(per_source)) for _ in range(sources)]
+    total = sources * per_source
+    start = time.perf_counter()
+    merged = list(merge_sorted_sources(*data))
+    time_heap = time.perf_counter() - start
+    start = time.perf_counter()
+    concatenated = sorted(chain(*data))
+    time_sorted = time.perf_counter() - start
+    assert merged == concatenated, "La fusión no coincide con sorted()"
+    print(f"{sources} fuentes x {per_source} | heap: {total / time_heap:,.0f} elem/s | "
+          f"concatenar + sorted(): {total / time_sorted:,.0f} elem/s")
+
+# Motor de sumas: se ordena UNA copia y se reutiliza para todas las consultas (find_for_sum ordenaba en cada llamada).
+# pairs usa two pointers sobre la copia ordenada; k_sum baja recursivamente hasta pairs: O(n^(k-1)).
+# Para una sola consulta sobre datos sin ordenar, pairs_with_sum_hash evita ordenar: O(n) con un set.
+class PairSumIndex:
+    """Consultas de pares / k-tuplas con suma objetivo sobre una copia ordenada de values.
+    presorted=True usa values tal cual (ya ordenada), sin copiarla."""
+    def __init__(self, values, presorted: bool = False):
+        self.values = values if presorted else sorted(values)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def _pairs(self, target, start: int) -> list[tuple]:
+        values = self.values
+        result = []
+        left, right = start, len(values) - 1
+        while left < right:
+            total = values[left] + values[right]
+            if total < target:
+                left += 1
+            elif total > target:
+                right -= 1
+            else:
+                result.append((values[left], values[right]))
+                # salta repetidos para que cada par aparezca una sola vez
+                while left < right and values[left] == result[-1][0]:
+                    left += 1
+                while left < right and values[right] == result[-1][1]:
+                    right -= 1
+        return result
+
+    def pairs(self, target) -> list[tuple]:
+        """Todos los pares distintos (a, b) con a <= b y a + b == target, ordenados por a. O(n)."""
+        return self._pairs(target, 0)
+
+    def _k_sum(self, k: int, target, start: int) -> list[tuple]:
+        if k == 2:
+            return self._pairs(target, start)
+        values = self.values
+        result = []
+        for i in range(start, len(values) - k + 1):
+            if i > start and values[i] == values[i - 1]:
+                continue  # mismo primer elemento: generaría las mismas tuplas
+            if values[i] * k > target:
+                break  # el resto es aún mayor: ninguna tupla puede llegar a target
+            if values[i] + values[-1] * (k - 1) < target:
+                continue  # ni con los mayores se llega: probar un primer elemento más grande
+            for rest in self._k_sum(k - 1, target - values[i], i + 1):
+                result.append((values[i],) + rest)
+        return result
+
+    def k_sum(self, k: int, target) -> list[tuple] | None:
+        """Todas las k-tuplas distintas (en orden no decreciente) que suman target. None si k < 2."""
+        if not isinstance(k, int) or k < 2:
+            return None
+        return self._k_sum(k, target, 0)
+
+    def three_sum(self, target) -> list[tuple]:
+        return self._k_sum(3, target, 0)
+
+def pairs_with_sum_hash(values, target) -> list[tuple]:
+    """Pares distintos (a, b) con a <= b y a + b == target sin ordenar: una pasada con un set. O(n)."""
+    seen = set()
+    found = set()
+    result = []
+    for value in values:
+        complement = target - value
+        if complement in seen:
+            pair = (min(value, complement), max(value, complement))
+            if pair not in found:
+                found.add(pair)
+                result.append(pair)
+        seen.add(value)
+    return result
+
+def benchmark_pair_sums(n: int = 100_000, queries: int = 1_000) -> None:
+    """Muchas consultas sobre los mismos datos: ordenar en cada consulta vs una copia ordenada reutilizada vs hash."""
+    import random
+    import time
+    values = [random.randint(0, n) for _ in range(n)]
+    targets = [random.randint(0, 2 * n) for _ in range(queries)]
+    start = time.perf_counter()
+    per_query = [PairSumIndex(values).pairs(target) for target in targets]
+    time_sort_each = time.perf_counter() - start
+    start = time.perf_counter()
+    index = PairSumIndex(values)
+    reused = [index.pairs(target) for target in targets]
+    time_reused = time.perf_counter() - start
+    start = time.perf_counter()
+    hashed = [pairs_with_sum_hash(values, target) for target in targets]
+    time_hash = time.perf_counter() - start
+    assert per_query == reused and all(sorted(h) == r for h, r in zip(hashed, reused)), "Los modos no coinciden"
+    print(f"n={n} x {queries} consultas | ordenar cada vez: {time_sort_each:.2f}s | "
+          f"copia ordenada reutilizada: {time_reused:.2f}s | hash: {time_hash:.2f}s")
 
 
 # Ejercicio 3: Sliding Window - Análisis de Subarrays
@@ -320,6 +472,350 @@ print(window_sum_greater_than_obj(ventas_diarias, 500))
 print(count_positive_windows(ventas_diarias, 3))
 print(best_sales_period(ventas_diarias, 3))
 
+# Versión batch con NumPy: muchas series a la vez (una fila por tienda, una columna por día).
+# Con la suma acumulada (cumsum) la suma de cada ventana es acumulada[i + k] - acumulada[i], así todas las ventanas
+# de todas las series salen de una resta de matrices, sin bucles de Python por serie.
+def batch_sales_windows(sales, k: int) -> dict | None:
+    """max_average_window, count_positive_windows y best_sales_period para cada fila de una matriz (series × días).
+    Retorna {"max_average": array, "positive_windows": array, "best_period": array (series, 2)}, None si k no sirve."""
+    import numpy as np
+    sales = np.asarray(sales)
+    if sales.ndim != 2 or not isinstance(k, int) or k < 1 or sales.shape[1] < k:
+        return None
+    series, days = sales.shape
+    if np.issubdtype(sales.dtype, np.integer):
+        accumulated = np.zeros((series, days + 1), dtype=np.int64)
+        np.cumsum(sales, axis=1, out=accumulated[:, 1:])
+        windows = accumulated[:, k:] - accumulated[:, :-k]
+    else:
+        # Con floats restar acumuladas redondea distinto que las funciones escalares. Se repiten sus operaciones:
+        # la primera ventana con el sum() de Python (desde 3.12 compensa el redondeo, un bucle de sumas no daría
+        # lo mismo) y después se desliza día por día, vectorizado sobre todas las series: mismo resultado bit a bit.
+        sales = sales.astype(np.float64)
+        windows = np.empty((series, days - k + 1))
+        window = np.array([sum(row) for row in sales[:, :k].tolist()])
+        windows[:, 0] = window
+        for i in range(days - k):
+            window = window - sales[:, i] + sales[:, i + k]
+            windows[:, i + 1] = window
+    best_start = windows.argmax(axis=1)  # primera ventana con la suma máxima, igual que best_sales_period
+    return {
+        "max_average": windows.max(axis=1) / k,
+        "positive_windows": (windows > 0).sum(axis=1),
+        "best_period": np.stack([best_start, best_start + k - 1], axis=1),
+    }
+
+def benchmark_batch_windows(series: int = 10_000, days: int = 365, k: int = 7) -> None:
+    import time
+    import numpy as np
+    matrix = np.random.default_rng(0).integers(-50, 500, size=(series, days))
+    rows = matrix.tolist()
+    start = time.perf_counter()
+    scalar = [(max_average_window(row, k), count_positive_windows(row, k), best_sales_period(row, k)) for row in rows]
+    time_scalar = time.perf_counter() - start
+    start = time.perf_counter()
+    batch = batch_sales_windows(matrix, k)
+    time_batch = time.perf_counter() - start
+    same = all(
+        (average, positives, period) == (batch["max_average"][i], batch["positive_windows"][i], tuple(batch["best_period"][i]))
+        for i, (average, positives, period) in enumerate(scalar)
+    )
+    print(f"{series} x {days}, k={k} | escalar: {time_scalar / series * 1e6:.1f} µs por serie | "
+          f"batch: {time_batch / series * 1e6:.2f} µs por serie | mismos resultados: {same}")
+
+# Muchos objetivos sobre la misma serie: window_sum_greater_than_obj recorre la serie una vez POR objetivo.
+# Con ventas no negativas, la mejor suma de una ventana de largo L (best(L)) crece con L, así que la respuesta
+# para un objetivo es el menor L con best(L) >= objetivo: una búsqueda binaria sobre L. Las sumas prefijo se
+# calculan una vez y cada best(L) (una resta vectorizada) se comparte entre todos los objetivos:
+# con los objetivos ordenados, divide y vencerás reparte los objetivos entre la mitad baja y alta de L.
+def batch_min_windows(sales, objectives) -> list[int] | None:
+    """window_sum_greater_than_obj para cada objetivo, en el mismo orden. None si sales no es 1-D o tiene negativos.
+    Con enteros el resultado es exacto; con floats puede diferir solo en empates de redondeo."""
+    import numpy as np
+    from bisect import bisect_right
+    sales = np.asarray(sales)
+    if sales.ndim != 1 or (sales < 0).any():
+        return None
+    days = len(sales)
+    result = [0] * len(objectives)
+    if not days:
+        return result
+    accumulated = np.zeros(days + 1, dtype=np.int64 if np.issubdtype(sales.dtype, np.integer) else np.float64)
+    np.cumsum(sales, out=accumulated[1:])
+    best = {}
+
+    def best_sum(length: int):
+        if length not in best:
+            best[length] = (accumulated[length:] - accumulated[:-length]).max()
+        return best[length]
+
+    order = sorted(range(len(objectives)), key=objectives.__getitem__)
+    ordered = [objectives[i] for i in order]
+    pending = [(0, len(order), 1, days)]  # objetivos ordered[a:b] tienen respuesta en [low, high] (o ninguna)
+    while pending:
+        a, b, low, high = pending.pop()
+        if a == b:
+            continue
+        if low == high:
+            reached = bisect_right(ordered, best_sum(low), a, b)
+            for i in order[a:reached]:
+                result[i] = low
+            continue  # los demás superan incluso la mejor ventana posible: quedan en 0
+        middle = (low + high) // 2
+        split = bisect_right(ordered, best_sum(middle), a, b)
+        pending.append((a, split, low, middle))
+        pending.append((split, b, middle + 1, high))
+    return result
+
+def benchmark_batch_min_windows(days: int = 1_000_000, objectives: int = 1_000, checked: int = 3) -> None:
+    import random
+    import time
+    import numpy as np
+    sales = np.random.default_rng(0).integers(0, 500, size=days)
+    targets = [random.randint(1, 250 * 365) for _ in range(objectives)]  # hasta ~un año de ventas promedio
+    start = time.perf_counter()
+    batch = batch_min_windows(sales, targets)
+    time_batch = time.perf_counter() - start
+    values = sales.tolist()
+    start = time.perf_counter()
+    scalar = [window_sum_greater_than_obj(values, target) for target in targets[:checked]]
+    time_scalar = (time.perf_counter() - start) / checked * objectives  # extrapolado a todos los objetivos
+    assert scalar == batch[:checked], "batch_min_windows no coincide con window_sum_greater_than_obj"
+    print(f"{days} días x {objectives} objetivos | escalar: ~{time_scalar:.1f}s | batch: {time_batch:.2f}s "
+          f"({time_scalar / time_batch:.0f}x)")
+
+# Versión streaming: generadores que reciben cualquier iterable (socket, archivo, generador) y nunca lo convierten en
+# lista. Solo guardan los últimos k valores en un deque(maxlen=k): memoria O(k) sin importar el largo del stream.
+# Emiten un valor por cada ventana completa; el último valor emitido es el resultado de la función escalar.
+def stream_window_sums(values, k: int):
+    """Suma de cada ventana de k elementos consecutivos del stream."""
+    from collections import deque
+    if not isinstance(k, int) or k < 1:
+        return
+    window = deque(maxlen=k)
+    sum_window = 0
+    for value in values:
+        if len(window) == k:
+            sum_window = sum_window - window[0] + value  # mismo orden de operaciones que max_suma_subarray
+            window.append(value)  # con maxlen, el deque descarta solo el más antiguo
+        else:
+            window.append(value)
+            if len(window) < k:
+                continue
+            # la primera ventana con sum(), como sum(lista[:k]) en las escalares: desde 3.12 sum() compensa el
+            # redondeo de floats y sumar de a uno daría otro resultado
+            sum_window = sum(window)
+        yield sum_window
+
+def stream_window_averages(values, k: int):
+    """Promedio de cada ventana."""
+    for sum_window in stream_window_sums(values, k):
+        yield sum_window / k
+
+def stream_max_sum(values, k: int):
+    """Máxima suma de ventana vista hasta ahora (el último valor es max_suma_subarray)."""
+    from itertools import accumulate
+    return accumulate(stream_window_sums(values, k), max)
+
+def stream_max_average(values, k: int):
+    """Máximo promedio de ventana visto hasta ahora (el último valor es max_average_window)."""
+    from itertools import accumulate
+    return accumulate(stream_window_averages(values, k), max)
+
+def stream_positive_windows(values, k: int):
+    """Cantidad de ventanas con suma positiva vistas hasta ahora (el último valor es count_positive_windows)."""
+    count = 0
+    for sum_window in stream_window_sums(values, k):
+        if sum_window > 0:
+            count += 1
+        yield count
+
+# Máximo y mínimo de cada ventana con un deque monótono: guarda (índice, valor) de los candidatos a máximo en orden
+# decreciente. Al entrar un valor se sacan del final los que son menores (ya nunca serán máximo), y del inicio el que
+# quedó fuera de la ventana. Cada valor entra y sale una sola vez: O(n) total en vez de O(n·k) con max(ventana).
+def _monotonic_window(values, k: int, keep):
+    """Genera el extremo de cada ventana; keep(a, b) es True si a debe quedarse delante de b."""
+    from collections import deque
+    if not isinstance(k, int) or k < 1:
+        return
+    candidates = deque()  # (índice, valor), el extremo de la ventana siempre está al inicio
+    for i, value in enumerate(values):
+        while candidates and not keep(candidates[-1][1], value):
+            candidates.pop()
+        candidates.append((i, value))
+        if candidates[0][0] <= i - k:
+            candidates.popleft()
+        if i >= k - 1:
+            yield candidates[0][1]
+
+def sliding_window_max(values, k: int) -> list:
+    """Máximo de cada ventana de k elementos. O(n)"""
+    return list(_monotonic_window(values, k, lambda a, b: a > b))
+
+def sliding_window_min(values, k: int) -> list:
+    """Mínimo de cada ventana de k elementos. O(n)"""
+    return list(_monotonic_window(values, k, lambda a, b: a < b))
+
+# Mediana y percentiles de cada ventana: la ventana se mantiene también como lista ordenada.
+# bisect encuentra dónde insertar el que entra y dónde está el que sale en O(log k); insertar/borrar mueve
+# a lo sumo k punteros (memmove en C). Un valor se lee por índice en O(1) en vez de ordenar cada ventana.
+def _sorted_windows(values, k: int):
+    """Genera la ventana ordenada (la misma lista, actualizada) cada vez que está completa."""
+    from bisect import bisect_left, insort
+    from collections import deque
+    if not isinstance(k, int) or k < 1:
+        return
+    arrivals = deque()
+    ordered = []
+    for value in values:
+        arrivals.append(value)
+        insort(ordered, value)
+        if len(arrivals) > k:
+            del ordered[bisect_left(ordered, arrivals.popleft())]
+        if len(arrivals) == k:
+            yield ordered
+
+def sliding_window_median(values, k: int) -> list:
+    """Mediana de cada ventana (igual que statistics.median)."""
+    middle = k // 2
+    if k % 2:
+        return [ordered[middle] for ordered in _sorted_windows(values, k)]
+    return [(ordered[middle - 1] + ordered[middle]) / 2 for ordered in _sorted_windows(values, k)]
+
+def sliding_window_percentile(values, k: int, percentile: float) -> list | None:
+    """Percentil (0-100) de cada ventana con interpolación lineal entre los dos valores vecinos."""
+    if not 0 <= percentile <= 100:
+        return None
+    position = (k - 1) * percentile / 100
+    low = int(position)
+    fraction = position - low
+    result = []
+    for ordered in _sorted_windows(values, k):
+        value = ordered[low]
+        if fraction:
+            value = value + (ordered[low + 1] - value) * fraction
+        result.append(value)
+    return result
+
+def benchmark_sliding_extremes(n: int = 100_000, sizes: tuple = (10, 100, 1000)) -> None:
+    import random
+    import statistics
+    import time
+    values = [random.randint(0, 10_000) for _ in range(n)]
+    for k in sizes:
+        start = time.perf_counter()
+        naive_max = [max(values[i:i + k]) for i in range(n - k + 1)]
+        time_naive_max = time.perf_counter() - start
+        start = time.perf_counter()
+        fast_max = sliding_window_max(values, k)
+        time_max = time.perf_counter() - start
+        start = time.perf_counter()
+        naive_median = [statistics.median(values[i:i + k]) for i in range(n - k + 1)]
+        time_naive_median = time.perf_counter() - start
+        start = time.perf_counter()
+        fast_median = sliding_window_median(values, k)
+        time_median = time.perf_counter() - start
+        assert naive_max == fast_max and naive_median == fast_median, "Los resultados no coinciden"
+        print(f"n={n}, k={k} | max: rescan {time_naive_max:.3f} s vs deque {time_max:.3f} s | "
+              f"mediana: rescan {time_naive_median:.3f} s vs lista ordenada {time_median:.3f} s")
+
+# Índices de sumas por rango: "¿cuánto se vendió del día i al día j?" sin recorrer la ventana cada vez.
+# PrefixSums: para datos que no cambian, prefix[i] = suma de los primeros i días -> cada consulta es O(1).
+# FenwickTree: para datos con correcciones, cada nodo guarda la suma de un bloque de tamaño potencia de 2
+# -> consulta y actualización en O(log n).
+class PrefixSums:
+    """Sumas prefijo estáticas: range_sum O(1), construcción O(n)."""
+    def __init__(self, values):
+        from itertools import accumulate
+        self.prefix = list(accumulate(values, initial=0))
+
+    def __len__(self) -> int:
+        return len(self.prefix) - 1
+
+    def range_sum(self, start: int, end: int):
+        """Suma de values[start..end] (ambos inclusive, como best_sales_period). None si el rango no es válido."""
+        if not 0 <= start <= end < len(self):
+            return None
+        return self.prefix[end + 1] - self.prefix[start]
+
+class FenwickTree:
+    """Binary Indexed Tree: range_sum y update en O(log n), construcción O(n)."""
+    def __init__(self, values):
+        self.values = list(values)
+        self.tree = [0] + self.values  # el árbol usa índices desde 1
+        for i in range(1, len(self.tree)):
+            parent = i + (i & -i)
+            if parent < len(self.tree):
+                self.tree[parent] += self.tree[i]
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __getitem__(self, index: int):
+        return self.values[index]
+
+    def add(self, index: int, delta) -> None:
+        """Suma delta al día index. Como en una lista, un índice negativo cuenta desde el final."""
+        if not -len(self.values) <= index < len(self.values):
+            raise IndexError(f"index out of range: {index}")
+        if index < 0:
+            index += len(self.values)
+        self.values[index] += delta
+        i = index + 1
+        while i < len(self.tree):
+            self.tree[i] += delta
+            i += i & -i
+
+    def __setitem__(self, index: int, value) -> None:
+        """Corrección puntual: reemplaza el valor del día index."""
+        self.add(index, value - self.values[index])
+
+    def prefix_sum(self, count: int):
+        """Suma de los primeros count días."""
+        total = 0
+        i = min(count, len(self.values))
+        while i > 0:
+            total += self.tree[i]
+            i -= i & -i
+        return total
+
+    def range_sum(self, start: int, end: int):
+        """Suma de values[start..end] (ambos inclusive). None si el rango no es válido."""
+        if not 0 <= start <= end < len(self.values):
+            return None
+        return self.prefix_sum(end + 1) - self.prefix_sum(start)
+
+def benchmark_range_sums(days: int = 1_000_000, queries: int = 100_000, updates: int = 10_000) -> None:
+    """Consultas de rango aleatorias: sum() del slice vs PrefixSums vs FenwickTree, y correcciones en el Fenwick."""
+    import random
+    import time
+    sales = [random.randint(0, 1000) for _ in range(days)]
+    ranges = [tuple(sorted((random.randrange(days), random.randrange(days)))) for _ in range(queries)]
+    start = time.perf_counter()
+    naive = [sum(sales[i:j + 1]) for i, j in ranges[:max(1, queries // 100)]]
+    time_naive = (time.perf_counter() - start) / len(naive)
+    start = time.perf_counter()
+    prefix = PrefixSums(sales)
+    time_build_prefix = time.perf_counter() - start
+    start = time.perf_counter()
+    tree = FenwickTree(sales)
+    time_build_tree = time.perf_counter() - start
+    start = time.perf_counter()
+    by_prefix = [prefix.range_sum(i, j) for i, j in ranges]
+    time_prefix = (time.perf_counter() - start) / queries
+    start = time.perf_counter()
+    by_tree = [tree.range_sum(i, j) for i, j in ranges]
+    time_tree = (time.perf_counter() - start) / queries
+    assert by_prefix == by_tree and naive == by_prefix[:len(naive)], "Las sumas por rango no coinciden"
+    start = time.perf_counter()
+    for _ in range(updates):
+        tree[random.randrange(days)] = random.randint(0, 1000)
+    time_update = (time.perf_counter() - start) / updates
+    print(f"{days} días | sum(slice): {time_naive * 1e6:.1f} µs/consulta | "
+          f"prefijos: {time_prefix * 1e6:.2f} µs/consulta (construir {time_build_prefix:.2f}s) | "
+          f"fenwick: {time_tree * 1e6:.2f} µs/consulta, {time_update * 1e6:.2f} µs/corrección "
+          f"(construir {time_build_tree:.2f}s)")
+
 # Ejercicio 4: Rotación y Manipulación In-Place
 # Contexto: Operaciones eficientes sin crear copias.
 # Requisitos: Implementa estas funciones que modifican listas in-place:
@@ -330,11 +826,15 @@ print(best_sales_period(ventas_diarias, 3))
 #    - Modifica in-place, no crea nueva lista
 #    - O(n) tiempo, O(1) espacio
 
+# Las rotaciones usan el algoritmo de inversión: tres reverse_range que solo intercambian elementos,
+# sin slices temporales. Sirven para list, array.array, bytearray y memoryview escribibles.
 def rotate_right(list1 : list, k : int) -> None:
+    if not list1:
+        return list1
     k = k % len(list1)
-    list1[:] = list1[-k:] + list1[:-k]
-    list1.reverse()
-    list1[:k] = list1[:k][::-1]
+    reverse_range(list1, 0, len(list1) - 1)
+    reverse_range(list1, 0, k - 1)
+    reverse_range(list1, k, len(list1) - 1)
     return list1
 
 # 2. rotar_izquierda(lista: list, k: int) -> None
@@ -342,11 +842,9 @@ def rotate_right(list1 : list, k : int) -> None:
 #    - [1,2,3,4,5] con k=2 → [3,4,5,1,2]
 
 def rotate_left(list1 : list, k : int) -> None: 
-    k = k % len(list1)
-    list1[:] = list1[k:] + list1[:k]
-    list1.reverse()
-    list1[:len(list1) - k] = list1[:len(list1) - k][::-1]
-    return list1
+    if not list1:
+        return list1
+    return rotate_right(list1, len(list1) - k % len(list1))
 
 # 3. invertir_rango(lista: list, inicio: int, fin: int) -> None
 #    - Invierte elementos entre índices inicio y fin (inclusivo)
@@ -390,6 +888,35 @@ print(reverse_range([1, 2, 3, 4, 5], 1, 3))
 print(intercalate_halves([1, 2, 3, 4, 5, 6]))
 print(reorganize_even_odd([1, 2, 3, 4, 5, 6]))
 
+def benchmark_in_place_rotation(sizes: tuple = (1_000, 100_000, 1_000_000)) -> None:
+    """Mide tiempo y pico de memoria (tracemalloc) de rotate_right y reverse_range en cada tipo de buffer.
+    El pico no debe crecer con n: si alguna función copiara la secuencia, crecería O(n)."""
+    import time
+    import tracemalloc
+    from array import array
+    peaks = {}
+    for n in sizes:
+        buffers = {
+            "list": list(range(n)),
+            "array('q')": array("q", range(n)),
+            "bytearray": bytearray(i % 256 for i in range(n)),
+            "memoryview": memoryview(bytearray(i % 256 for i in range(n))),
+        }
+        for name, buffer in buffers.items():
+            expected = list(buffer[-(n // 3):]) + list(buffer[:-(n // 3)])
+            tracemalloc.start()
+            start = time.perf_counter()
+            rotate_right(buffer, n // 3)
+            reverse_range(buffer, 1, n - 2)
+            reverse_range(buffer, 1, n - 2)
+            elapsed = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            assert list(buffer) == expected, f"{name}: rotación incorrecta"
+            peaks.setdefault(name, []).append(peak)
+            print(f"n={n} | {name}: {elapsed * 1000:.1f} ms | pico {peak} bytes")
+    for name, values in peaks.items():
+        assert max(values) < 1024, f"{name}: la memoria extra crece con n ({values})"
 
 
 # Ejercicio 5: Procesador de Logs con Operaciones Avanzadas (Integrador)
@@ -404,82 +931,933 @@ logs = [
     {"timestamp": 1005, "nivel": "INFO", "mensaje": "Request procesado", "usuario": "user1"},
 ] * 100  # 600 logs
 
+# Almacenamiento columnar: cada dict de log ocupa cientos de bytes (tabla hash + punteros a las llaves),
+# con decenas de millones de logs ese overhead es casi toda la memoria.
+# En vez de una lista de dicts guardamos cada campo en su propia "columna":
+#   - timestamps en un array('q') (8 bytes por log, sin objetos int)
+#   - niveles y usuarios "internados": cada texto distinto se guarda una vez y el log solo guarda su código entero
+#   - mensajes en una tabla de strings compartida (los mensajes se repiten mucho)
+class ColumnasLogs:
+    """Logs guardados por columnas. Se comporta como una lista de dicts (len, índices, slicing, iteración)."""
+    def __init__(self, logs: list[dict] = ()):
+        self.timestamps = array("q")
+        self.niveles = array("H")   # código de nivel por log
+        self.usuarios = array("I")  # código de usuario por log
+        self.mensajes = array("I")  # código de mensaje por log
+        # código -> texto
+        self.tabla_niveles = []
+        self.tabla_usuarios = []
+        self.tabla_mensajes = []
+        # texto -> código
+        self.codigos_niveles = {}
+        self.codigos_usuarios = {}
+        self.codigos_mensajes = {}
+        for log in logs:
+            self.agregar(log)
+
+    @staticmethod
+    def _codigo(tabla: list, codigos: dict, valor: str) -> int:
+        """Retorna el código de valor, si es nuevo lo agrega a la tabla. O(1)"""
+        codigo = codigos.get(valor)
+        if codigo is None:
+            codigo = len(tabla)
+            codigos[valor] = codigo
+            tabla.append(valor)
+        return codigo
+
+    def agregar(self, log: dict) -> None:
+        """Agrega un log al final de las columnas. O(1) amortizado."""
+        self.timestamps.append(log["timestamp"])
+        self.niveles.append(self._codigo(self.tabla_niveles, self.codigos_niveles, log["nivel"]))
+        self.usuarios.append(self._codigo(self.tabla_usuarios, self.codigos_usuarios, log["usuario"]))
+        self.mensajes.append(self._codigo(self.tabla_mensajes, self.codigos_mensajes, log["mensaje"]))
+
+    def fila(self, i: int) -> dict:
+        """Reconstruye el dict del log en la posición i."""
+        return {
+            "timestamp": self.timestamps[i],
+            "nivel": self.tabla_niveles[self.niveles[i]],
+            "mensaje": self.tabla_mensajes[self.mensajes[i]],
+            "usuario": self.tabla_usuarios[self.usuarios[i]],
+        }
+
+    def filas(self, ids) -> list[dict]:
+        """Materializa los dicts solo de las posiciones pedidas."""
+        return [self.fila(i) for i in ids]
+
+    append = agregar  # para usarla como una lista
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return self.filas(range(*i.indices(len(self))))
+        return self.fila(i)
+
+    def __iter__(self):
+        return (self.fila(i) for i in range(len(self)))
+
+
+# Índice de timestamps: en vez de recorrer todos los logs en cada consulta de rango (O(n)),
+# mantenemos los timestamps ordenados y buscamos los bordes del rango con búsqueda binaria (bisect) en O(log n).
+# Si los logs llegan en orden el índice es la misma lista de posiciones (0, 1, 2...) y no hay que guardarlas,
+# el rango es directamente un slice de los logs.
+# Si llega un log fuera de orden solo se marca el índice como desordenado y se re-ordena en la próxima consulta:
+# se ordena solo la cola que llegó desde el último orden y se intercala con la parte ya ordenada.
+class IndiceTimestamps:
+    """Timestamps ordenados -> posición del log en el procesador."""
+    def __init__(self):
+        self.claves = array("q")  # timestamps ordenados
+        self.ids = None           # posición de cada clave, None mientras sea la identidad (0, 1, 2...)
+        self.indexados = 0        # cuántos logs ya están en el índice
+        self.ordenado = True      # False si llegó un timestamp menor al último
+        self.ordenados = 0        # claves[:ordenados] está ordenado; lo que sigue es la cola sin ordenar
+
+    def agregar(self, timestamp: int) -> None:
+        """Agrega el timestamp del siguiente log. O(1) amortizado."""
+        if self.ordenado and self.claves and timestamp < self.claves[-1]:
+            self.ordenado = False
+            self.ordenados = len(self.claves)
+        self.claves.append(timestamp)
+        if self.ids is not None:
+            self.ids.append(self.indexados)
+        self.indexados += 1
+
+    def _ordenar(self) -> None:
+        """Ordena por (timestamp, posición) solo la cola nueva y la intercala con la parte ordenada.
+        La parte ordenada se copia por tramos (memcpy de arrays), sin tuplas por log: memoria extra O(n) en
+        arrays de 8 bytes + O(cola) en tuplas, en vez de una tupla por cada log del índice."""
+        n = self.ordenados
+        ids_previos = range(self.indexados) if self.ids is None else self.ids
+        cola = sorted(zip(self.claves[n:], ids_previos[n:]))
+        claves, ids = array("q"), array("q")
+        ancho = self.claves.itemsize
+        with memoryview(self.claves).cast("B") as vista_claves:  # bytes de las claves, sin copiarlas
+            previo = 0
+            for ts, i in cola:
+                # bisect_right: con el mismo timestamp la parte ordenada tiene posiciones menores, va primero
+                posicion = bisect_right(self.claves, ts, previo, n)
+                claves.frombytes(vista_claves[previo * ancho:posicion * ancho])
+                ids.extend(ids_previos[previo:posicion])
+                claves.append(ts)
+                ids.append(i)
+                previo = posicion
+            claves.frombytes(vista_claves[previo * ancho:n * ancho])
+            ids.extend(ids_previos[previo:n])
+        self.claves, self.ids = claves, ids
+        self.ordenado = True
+        self.ordenados = len(claves)
+
+    def rango(self, inicio: int, fin: int) -> tuple[int, int]:
+        """Retorna (lo, hi): las claves[lo:hi] están entre inicio y fin. O(log n)"""
+        if not self.ordenado:
+            self._ordenar()
+        return bisect_left(self.claves, inicio), bisect_right(self.claves, fin)
+
+
+# HyperLogLog: cuenta cuántos elementos distintos hubo sin guardarlos.
+# Cada elemento se convierte en un hash de 64 bits; los primeros p bits eligen uno de m = 2^p registros y el registro
+# guarda la mayor cantidad de ceros iniciales vista en el resto del hash. Con muchos distintos aparecen hashes con
+# más ceros, y con esos m máximos se estima la cantidad. Memoria fija (m bytes) sin importar cuántos usuarios haya,
+# error relativo típico ≈ 1.04 / sqrt(m).
+# Dos sketches con el mismo m se fusionan tomando el máximo de cada registro (como unir sets).
+# El hash es blake2b y no hash(): hash() de strings cambia entre procesos y los sketches de otros procesos no coincidirían.
+class HyperLogLog:
+    """Conteo aproximado de elementos distintos. Tiene add, |=, copy y len como un set."""
+    ERROR_MINIMO = 1.04 / 2 ** 9  # error típico con p=18, el máximo de registros (2**18)
+
+    def __init__(self, error: float = 0.01):
+        import math
+        if not isinstance(error, (int, float)) or not 0 < error < 1:
+            raise ValueError(f"error must be between 0 and 1, received: {error}")
+        elif error < HyperLogLog.ERROR_MINIMO:  # más precisión que p=18 (256 KB): usar un set exacto
+            raise ValueError(f"error must be at least {HyperLogLog.ERROR_MINIMO:.5f} (p=18), received: {error}")
+        self.error = error
+        self.p = max(4, min(18, math.ceil(math.log2((1.04 / error) ** 2))))  # 0.01 -> p=14, 16 KB
+        self.m = 1 << self.p
+        self.registros = bytearray(self.m)
+
+    def add(self, valor) -> None:
+        h = int.from_bytes(blake2b(str(valor).encode(), digest_size=8).digest(), "big")
+        indice = h >> (64 - self.p)
+        resto = h & ((1 << (64 - self.p)) - 1)
+        ceros = (64 - self.p) - resto.bit_length() + 1  # posición del primer 1
+        if ceros > self.registros[indice]:
+            self.registros[indice] = ceros
+
+    def __ior__(self, otro: "HyperLogLog") -> "HyperLogLog":
+        if otro.p != self.p:
+            raise ValueError("HyperLogLog sketches must have the same error to be merged")
+        self.registros = bytearray(map(max, self.registros, otro.registros))
+        return self
+
+    def copy(self) -> "HyperLogLog":
+        copia = HyperLogLog(self.error)
+        copia.registros = bytearray(self.registros)
+        return copia
+
+    def estimar(self) -> float:
+        import math
+        alpha = {16: 0.673, 32: 0.697, 64: 0.709}.get(self.m, 0.7213 / (1 + 1.079 / self.m))
+        estimacion = alpha * self.m * self.m / sum(2.0 ** -r for r in self.registros)
+        vacios = self.registros.count(0)
+        if estimacion <= 2.5 * self.m and vacios:  # pocos elementos: contar registros vacíos es más preciso
+            estimacion = self.m * math.log(self.m / vacios)
+        return estimacion
+
+    def __len__(self) -> int:
+        return round(self.estimar())
+
+    def __eq__(self, otro) -> bool:
+        if isinstance(otro, HyperLogLog):
+            return self.p == otro.p and self.registros == otro.registros
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"HyperLogLog(~{len(self)} distintos, error={self.error})"
+
+
+# Acumuladores: cada sección del resumen es un objeto que recibe los logs uno por uno (agregar) y al final
+# construye su resultado. Así varias secciones se calculan en UNA sola pasada sobre los logs.
+# Reciben (posición, timestamp, nivel, usuario); en modo columnar nivel y usuario son los códigos enteros
+# y se traducen a texto solo en resultado().
+class AcumuladorNiveles:
+    """Sección estadisticas_por_nivel: cantidad, usuarios únicos, primero y último timestamp.
+    Con error, usuarios_unicos es un HyperLogLog en vez de un set. nombres_usuarios (modo columnar) hace que el
+    sketch reciba el nombre del usuario y no su código, así se puede fusionar con sketches de otros procesadores."""
+    def __init__(self, error: float | None = None, nombres_usuarios: list | None = None):
+        self.por_nivel = {}
+        self.error = error
+        self.nombres_usuarios = nombres_usuarios if error is not None else None
+
+    def agregar(self, i: int, ts: int, nivel, usuario) -> None:
+        stats = self.por_nivel.get(nivel)
+        if stats is None:
+            usuarios = set() if self.error is None else HyperLogLog(self.error)
+            stats = self.por_nivel[nivel] = {"cantidad": 0, "usuarios_unicos": usuarios, "primero": ts, "ultimo": ts}
+        stats["cantidad"] += 1
+        if self.nombres_usuarios is None:
+            stats["usuarios_unicos"].add(usuario)
+        else:
+            stats["usuarios_unicos"].add(self.nombres_usuarios[usuario])
+        if ts < stats["primero"]:
+            stats["primero"] = ts
+        if ts > stats["ultimo"]:
+            stats["ultimo"] = ts
+
+    def fusionar(self, otro: "AcumuladorNiveles") -> None:
+        """Suma las estadísticas de otro acumulador (otro shard de logs)."""
+        for nivel, stats_otro in otro.por_nivel.items():
+            stats = self.por_nivel.get(nivel)
+            if stats is None:
+                self.por_nivel[nivel] = stats_otro
+                continue
+            stats["cantidad"] += stats_otro["cantidad"]
+            stats["usuarios_unicos"] |= stats_otro["usuarios_unicos"]
+            stats["primero"] = min(stats["primero"], stats_otro["primero"])
+            stats["ultimo"] = max(stats["ultimo"], stats_otro["ultimo"])
+
+    def resultado(self, logs, nombres_niveles: list | None = None, nombres_usuarios: list | None = None) -> dict:
+        if nombres_niveles is None:
+            return self.por_nivel
+        if self.error is not None:  # el sketch ya tiene los nombres
+            return {nombres_niveles[nivel]: {**stats, "usuarios_unicos": stats["usuarios_unicos"].copy()} for nivel, stats in self.por_nivel.items()}
+        return {
+            nombres_niveles[nivel]: {**stats, "usuarios_unicos": {nombres_usuarios[u] for u in stats["usuarios_unicos"]}}
+            for nivel, stats in self.por_nivel.items()
+        }
+
+
+class AcumuladorUsuarios:
+    """Sección agrupar_por_usuario: guarda posiciones y materializa los logs al final."""
+    def __init__(self):
+        self.ids_por_usuario = {}
+
+    def agregar(self, i: int, ts: int, nivel, usuario) -> None:
+        ids = self.ids_por_usuario.get(usuario)
+        if ids is None:
+            ids = self.ids_por_usuario[usuario] = []
+        ids.append(i)
+
+    def fusionar(self, otro: "AcumuladorUsuarios") -> None:
+        """Agrega las posiciones de otro shard, que debe venir DESPUÉS de este (mantiene el orden de llegada)."""
+        for usuario, ids_otro in otro.ids_por_usuario.items():
+            ids = self.ids_por_usuario.get(usuario)
+            if ids is None:
+                self.ids_por_usuario[usuario] = ids_otro
+            else:
+                ids.extend(ids_otro)
+
+    def resultado(self, logs, nombres_niveles: list | None = None, nombres_usuarios: list | None = None) -> dict:
+        return {
+            usuario if nombres_usuarios is None else nombres_usuarios[usuario]: [logs[i] for i in ids]
+            for usuario, ids in self.ids_por_usuario.items()
+        }
+
+
+class AcumuladorRango:
+    """Sección logs_en_rango: logs con inicio <= timestamp <= fin, ordenados por timestamp."""
+    def __init__(self, inicio: int, fin: int):
+        self.inicio = inicio
+        self.fin = fin
+        self.encontrados = []  # (timestamp, posición)
+
+    def agregar(self, i: int, ts: int, nivel, usuario) -> None:
+        if self.inicio <= ts <= self.fin:
+            self.encontrados.append((ts, i))
+
+    def resultado(self, logs, nombres_niveles: list | None = None, nombres_usuarios: list | None = None) -> list:
+        self.encontrados.sort()  # solo ordena el resultado, no todos los logs
+        return [logs[i] for _, i in self.encontrados]
+
+
+class AcumuladorFiltroNivel:
+    """Sección filtrar_por_nivel: posiciones de los logs con el nivel pedido."""
+    def __init__(self, nivel):
+        self.nivel = nivel
+        self.ids = []
+
+    def agregar(self, i: int, ts: int, nivel, usuario) -> None:
+        if nivel == self.nivel:
+            self.ids.append(i)
+
+    def resultado(self, logs, nombres_niveles: list | None = None, nombres_usuarios: list | None = None) -> list:
+        return [logs[i] for i in self.ids]
+
+
+# Tabla de nombres de usuarios del worker actual. El initializer del pool la recibe una sola vez
+# por proceso, así no viaja (pickle) dentro de cada tarea.
+_tabla_usuarios = None
+# Con fork los workers heredan los logs del proceso padre (copy-on-write): solo reciben rangos, no datos.
+_logs_worker = None
+
+
+def _preparar_worker(logs, nombres_usuarios: list | None) -> None:
+    global _logs_worker, _tabla_usuarios
+    _logs_worker = logs
+    _tabla_usuarios = nombres_usuarios
+
+
+def _filas_rango(logs, inicio: int, fin: int):
+    """(timestamp, nivel, usuario) de logs[inicio:fin], guardados en columnas o como dicts."""
+    if isinstance(logs, ColumnasLogs):
+        return zip(logs.timestamps[inicio:fin], logs.niveles[inicio:fin], logs.usuarios[inicio:fin])
+    return ((log["timestamp"], log["nivel"], log["usuario"]) for log in logs[inicio:fin])
+
+
+def _acumular(clase_acumulador, inicio: int, filas, nombres_usuarios: list | None = None):
+    """Alimenta un acumulador nuevo con filas (timestamp, nivel, usuario) y lo retorna para fusionarlo.
+    Sin nombres_usuarios se usa la tabla que recibió el worker; si hay tabla, el acumulador la recibe."""
+    if nombres_usuarios is None:
+        nombres_usuarios = _tabla_usuarios
+    if nombres_usuarios is None:
+        acumulador = clase_acumulador()
+    else:
+        acumulador = clase_acumulador(nombres_usuarios=nombres_usuarios)
+    agregar = acumulador.agregar
+    for i, (ts, nivel, usuario) in enumerate(filas, start=inicio):
+        agregar(i, ts, nivel, usuario)
+    return acumulador
+
+
+# Tareas de cada proceso en el modo paralelo. Tienen que ser funciones del módulo para que
+# ProcessPoolExecutor pueda enviarlas (pickle) a los otros procesos.
+def _acumular_rango(clase_acumulador, inicio: int, fin: int):
+    """Workers con fork: acumula logs[inicio:fin] de los logs heredados."""
+    return _acumular(clase_acumulador, inicio, _filas_rango(_logs_worker, inicio, fin))
+
+
+def _acumular_shard(clase_acumulador, inicio: int, shard):
+    """Workers sin fork (spawn/forkserver): shard es una tupla de columnas (timestamps, niveles, usuarios)."""
+    return _acumular(clase_acumulador, inicio, zip(*shard))
+
+
+# Lectura en streaming de archivos JSON lines (un log por línea).
+# mmap mapea el archivo a memoria sin leerlo completo: el sistema operativo carga las páginas a medida que se leen.
+# Las páginas ya leídas siguen contando en el RSS del proceso hasta que se sueltan (MADV_SEQUENTIAL no las suelta),
+# por eso cada _VENTANA_MMAP bytes consumidos se liberan con MADV_DONTNEED: el pico queda en ~1 ventana aunque
+# el archivo tenga varios GB. Cada línea se convierte a dict solo cuando se pide el siguiente log (generador).
+_VENTANA_MMAP = 8 * 1024 * 1024
+
+def leer_jsonl(ruta: str):
+    """Genera los logs de un archivo JSON lines uno por uno. Memoria O(1 línea + _VENTANA_MMAP)."""
+    import json
+    import mmap
+    import os
+    if not os.path.getsize(ruta):  # mmap no acepta archivos vacíos
+        return
+    with open(ruta, "rb") as archivo, mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+        soltar = hasattr(mapa, "madvise") and hasattr(mmap, "MADV_DONTNEED")  # sin madvise (Windows) lo hace el SO
+        if hasattr(mapa, "madvise"):
+            mapa.madvise(mmap.MADV_SEQUENTIAL)  # lectura secuencial: el SO puede leer adelantado
+        liberado = 0  # todo lo anterior a este byte ya se soltó
+        for linea in iter(mapa.readline, b""):
+            if linea.strip():
+                yield json.loads(linea)
+            if soltar and mapa.tell() - liberado >= _VENTANA_MMAP:
+                hasta = mapa.tell() - mapa.tell() % mmap.PAGESIZE  # madvise trabaja con páginas completas
+                mapa.madvise(mmap.MADV_DONTNEED, liberado, hasta - liberado)
+                liberado = hasta
+
+
+def estadisticas_jsonl(ruta: str, error_usuarios: float | None = None) -> dict[str, dict]:
+    """estadisticas_por_nivel de un archivo JSON lines sin guardar los logs: la memoria no crece con el archivo
+    (solo con la cantidad de niveles y usuarios distintos, o nada si error_usuarios usa HyperLogLog)."""
+    acumulador = AcumuladorNiveles(error_usuarios)
+    for i, log in enumerate(leer_jsonl(ruta)):
+        acumulador.agregar(i, log["timestamp"], log["nivel"], log["usuario"])
+    return acumulador.resultado(None)
+
+
+# Space-Saving: los K valores más frecuentes de un stream guardando solo `capacidad` contadores.
+# Si llega un valor que no está y los contadores están llenos, reemplaza al de menor conteo y hereda ese conteo
+# (+1). Así el conteo nunca es menor al real y sobreestima como mucho en `error` (el conteo heredado).
+# Los valores se agrupan por conteo (conteo -> set de valores) para conocer el mínimo en O(1) sin ordenar.
+class SpaceSaving:
+    """Heavy hitters aproximados: O(1) por valor, memoria O(capacidad)."""
+    def __init__(self, capacidad: int = 64):
+        if not isinstance(capacidad, int) or capacidad < 1:
+            raise ValueError(f"capacidad must be a positive integer, received: {capacidad}")
+        self.capacidad = capacidad
+        self.conteos = {}     # valor -> conteo (cota superior del real)
+        self.errores = {}     # valor -> cuánto pudo sobreestimar
+        self.por_conteo = {}  # conteo -> set de valores con ese conteo
+        self.minimo = 0
+
+    def _mover(self, valor, desde: int, hasta: int) -> None:
+        valores = self.por_conteo[desde]
+        valores.discard(valor)
+        if not valores:
+            del self.por_conteo[desde]
+            if desde == self.minimo:
+                self.minimo = hasta  # el valor que se movió ahora tiene el menor conteo
+        self.por_conteo.setdefault(hasta, set()).add(valor)
+
+    def add(self, valor) -> None:
+        conteo = self.conteos.get(valor)
+        if conteo is not None:
+            self.conteos[valor] = conteo + 1
+            self._mover(valor, conteo, conteo + 1)
+        elif len(self.conteos) < self.capacidad:
+            self.conteos[valor] = 1
+            self.errores[valor] = 0
+            self.por_conteo.setdefault(1, set()).add(valor)
+            self.minimo = 1
+        else:
+            # reemplazar un valor con el menor conteo, el nuevo hereda ese conteo + 1
+            minimo = self.minimo
+            desplazado = next(iter(self.por_conteo[minimo]))
+            del self.conteos[desplazado]
+            del self.errores[desplazado]
+            self.por_conteo[minimo].discard(desplazado)
+            self.por_conteo[minimo].add(valor)
+            self.conteos[valor] = minimo + 1
+            self.errores[valor] = minimo
+            self._mover(valor, minimo, minimo + 1)
+
+    def top(self, k: int) -> list[tuple]:
+        """Los k valores con mayor conteo: [(valor, conteo, error)]. Ordena solo los contadores, no los logs.
+        k no puede superar la capacidad: más allá de los contadores guardados no hay información."""
+        if k > self.capacidad:
+            raise ValueError(f"k must be <= capacidad ({self.capacidad}), received: {k}")
+        mayores = sorted(self.conteos.items(), key=lambda par: par[1], reverse=True)[:k]
+        return [(valor, conteo, self.errores[valor]) for valor, conteo in mayores]
+
+
+# Índice secundario: valor (nivel o usuario) -> posiciones de sus logs en orden de llegada.
+# Las posiciones se guardan en array('q') (8 bytes cada una) en vez de listas de ints.
+class IndiceSecundario:
+    """valor -> posiciones de los logs con ese valor. Se actualiza en O(1) por log."""
+    def __init__(self):
+        self.ids = {}
+
+    def agregar(self, valor, i: int) -> None:
+        ids = self.ids.get(valor)
+        if ids is None:
+            ids = self.ids[valor] = array("q")
+        ids.append(i)
+
+    def posiciones(self, valor):
+        return self.ids.get(valor, ())
+
+
+# Buffer circular (ring buffer): lista de capacidad fija. Cuando está lleno, el log nuevo sobrescribe al más antiguo,
+# así la memoria no crece aunque lleguen logs sin parar. Solo se mueven dos enteros (inicio y tamaño), nunca se desplaza la lista.
+class BufferCircular:
+    """Guarda los últimos `capacidad` logs. Se comporta como una lista del más antiguo al más reciente."""
+    def __init__(self, capacidad: int):
+        self.datos = [None] * capacidad
+        self.capacidad = capacidad
+        self.inicio = 0       # posición en datos del log más antiguo
+        self.tamano = 0       # logs guardados
+        self.total = 0        # logs recibidos desde el inicio (incluye los descartados)
+
+    def append(self, log: dict) -> None:
+        """Agrega un log, si el buffer está lleno descarta el más antiguo. O(1)"""
+        self.datos[(self.inicio + self.tamano) % self.capacidad] = log
+        if self.tamano < self.capacidad:
+            self.tamano += 1
+        else:
+            self.inicio = (self.inicio + 1) % self.capacidad
+        self.total += 1
+
+    @property
+    def descartados(self) -> int:
+        return self.total - self.tamano
+
+    def __len__(self) -> int:
+        return self.tamano
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self.tamano))]
+        if i < 0:
+            i += self.tamano
+        if not 0 <= i < self.tamano:
+            raise IndexError("BufferCircular index out of range")
+        return self.datos[(self.inicio + i) % self.capacidad]
+
+    def __iter__(self):
+        return (self.datos[(self.inicio + i) % self.capacidad] for i in range(self.tamano))
+
+    def ultimos(self, n: int) -> "VistaBuffer":
+        return VistaBuffer(self, min(n, self.tamano))
+
+
+class VistaBuffer:
+    """Últimos n logs del buffer sin copiarlos: cada acceso lee directo del buffer.
+    Es válida hasta el próximo append: después leerla lanza IndexError (para guardarla, copiarla con list())."""
+    def __init__(self, buffer: BufferCircular, n: int):
+        self.buffer = buffer
+        self.n = n
+        self.total = buffer.total  # logs recibidos al crear la vista: si cambia, el buffer ya no tiene esos logs
+
+    def _verificar(self) -> None:
+        if self.buffer.total != self.total:
+            raise IndexError("VistaBuffer is stale: the buffer received new logs")
+
+    def __len__(self) -> int:
+        return self.n
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self.n))]
+        self._verificar()
+        if i < 0:
+            i += self.n
+        if not 0 <= i < self.n:
+            raise IndexError("VistaBuffer index out of range")
+        return self.buffer[len(self.buffer) - self.n + i]
+
+    def __iter__(self):
+        self._verificar()
+        inicio = len(self.buffer) - self.n
+        for j in range(inicio, len(self.buffer)):
+            self._verificar()
+            yield self.buffer[j]
+
+    def __eq__(self, otro) -> bool:
+        if isinstance(otro, (list, VistaBuffer)):
+            return list(self) == list(otro)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+
 # Implementa clase ProcesadorLogs:
 class ProcesadorLogs:
-    def __init__(self, logs: list[dict]):
-        """Inicializa con lista de logs."""
-        self.logs = logs
-    
+    def __init__(self, logs: list[dict], columnar: bool = False, capacidad: int | None = None, error_usuarios: float | None = None,
+                 capacidad_top: int = 64):
+        """Inicializa con lista de logs.
+        columnar=True guarda los logs en ColumnasLogs (mucha menos memoria por log).
+        capacidad=N guarda solo los últimos N logs en un BufferCircular (memoria constante), las estadísticas
+        por nivel siguen contando los logs descartados.
+        error_usuarios=0.01 cuenta usuarios_unicos con HyperLogLog (~1% de error) en vez de un set de nombres.
+        Con capacidad error_usuarios es 0.01 si no se indica: un set exacto crecería con cada usuario distinto.
+        capacidad_top: contadores de SpaceSaving para top_mensajes/top_usuarios (exacto si hay menos valores distintos).
+        Los logs se copian a un almacenamiento propio (lista, columnas o buffer): agregar nuevos solo con append/extend.
+        No reemplazar ni modificar logs de self.logs (ni los dicts recibidos): los índices no detectan esos cambios."""
+        if capacidad is not None and error_usuarios is None:
+            error_usuarios = 0.01  # memoria constante también para usuarios_unicos
+        if error_usuarios is not None:
+            HyperLogLog(error_usuarios)  # valida el error antes de recibir logs
+        self.error_usuarios = error_usuarios
+        if capacidad is not None and (not isinstance(capacidad, int) or capacidad < 1):
+            raise ValueError(f"capacidad must be a positive integer, received: {capacidad}")
+        if not isinstance(capacidad_top, int) or capacidad_top < 1:
+            raise ValueError(f"capacidad_top must be a positive integer, received: {capacidad_top}")
+        self.capacidad_top = capacidad_top
+        if capacidad is not None and columnar:
+            raise ValueError("capacidad is only supported with columnar=False")
+        self.columnar = columnar
+        self.acotado = capacidad is not None
+        self.pasadas = 0  # cuántas veces se recorrieron todos los logs (para comparar implementaciones)
+        if self.acotado:
+            self.logs = BufferCircular(capacidad)
+            self._reiniciar_indices()
+            self.extend(logs)
+        else:
+            self.logs = ColumnasLogs(logs) if columnar else list(logs)  # copia: append no modifica la lista de quien llama
+            self._reiniciar_indices()
+
+    def _reiniciar_indices(self) -> None:
+        # Índices que se mantienen al día mientras llegan logs (se llenan en la primera consulta o append)
+        self.indexados = 0                       # cuántos logs ya están en los índices
+        self.indice_ts = IndiceTimestamps()      # timestamp -> posición (logs_en_rango)
+        self.indice_niveles = IndiceSecundario()   # nivel -> posiciones (filtrar_por_nivel)
+        self.indice_usuarios = IndiceSecundario()  # usuario -> posiciones (agrupar_por_usuario)
+        self.stats_niveles = self._nuevo_acumulador_niveles()  # contadores de estadisticas_por_nivel
+        self.frecuentes_mensajes = SpaceSaving(self.capacidad_top)  # top_mensajes
+        self.frecuentes_usuarios = SpaceSaving(self.capacidad_top)  # top_usuarios
+
+    def _nuevo_acumulador_niveles(self) -> AcumuladorNiveles:
+        return AcumuladorNiveles(self.error_usuarios, self.logs.tabla_usuarios if self.columnar else None)
+
+    def _sincronizar(self, ingesta: bool = False) -> None:
+        """Agrega a los índices los logs que llegaron desde la última consulta (append o extend).
+        Solo procesa los logs nuevos: O(logs nuevos). ingesta=True no cuenta como pasada (son logs recién llegados)."""
+        if self.acotado:
+            # En el buffer solo se mantienen los contadores: los índices por posición crecerían sin límite.
+            # Los logs que se descartaron antes de sincronizar ya no se pueden contar (append/extend sincronizan cada log).
+            nuevos = min(self.logs.total - self.indexados, len(self.logs))
+            for i in range(len(self.logs) - nuevos, len(self.logs)):
+                log = self.logs[i]
+                self.stats_niveles.agregar(i, log["timestamp"], log["nivel"], log["usuario"])
+                self.frecuentes_mensajes.add(log["mensaje"])
+                self.frecuentes_usuarios.add(log["usuario"])
+            self.indexados = self.logs.total
+            return
+        if len(self.logs) < self.indexados:  # se borraron logs: reconstruir
+            self._reiniciar_indices()
+        if self.indexados == len(self.logs):
+            return
+        if not self.indexados and not ingesta:
+            self.pasadas += 1
+        nuevos = range(self.indexados, len(self.logs))
+        if self.columnar:
+            desde = nuevos.start
+            filas = zip(nuevos, self.logs.timestamps[desde:], self.logs.niveles[desde:], self.logs.usuarios[desde:], self.logs.mensajes[desde:])
+        else:
+            filas = ((i, self.logs[i]["timestamp"], self.logs[i]["nivel"], self.logs[i]["usuario"], self.logs[i]["mensaje"]) for i in nuevos)
+        for i, ts, nivel, usuario, mensaje in filas:
+            self.indice_ts.agregar(ts)
+            self.indice_niveles.agregar(nivel, i)
+            self.indice_usuarios.agregar(usuario, i)
+            self.stats_niveles.agregar(i, ts, nivel, usuario)
+            self.frecuentes_mensajes.add(mensaje)
+            self.frecuentes_usuarios.add(usuario)
+        self.indexados = len(self.logs)
+
+    @classmethod
+    def desde_jsonl(cls, ruta: str, columnar: bool = True) -> "ProcesadorLogs":
+        """Crea el procesador leyendo un archivo JSON lines en streaming.
+        Con columnar=True (por defecto) cada log queda en las columnas compactas y su dict se descarta al instante.
+        No es el camino de memoria plana: guarda todos los logs (columnas + índices, ~40 bytes o más por log),
+        la memoria crece con el archivo. Para solo agregar sin guardar logs usar estadisticas_jsonl."""
+        procesador = cls([], columnar=columnar)
+        procesador.extend(leer_jsonl(ruta))
+        return procesador
+
+    def append(self, log: dict) -> None | str:
+        """Agrega un log y actualiza los índices. O(1) amortizado."""
+        if not isinstance(log, dict) or not {"timestamp", "nivel", "mensaje", "usuario"} <= log.keys():
+            return "log must be a dict with timestamp, nivel, mensaje and usuario"
+        self._sincronizar()
+        self.logs.append(log)
+        self._sincronizar(ingesta=True)
+
+    def extend(self, nuevos_logs) -> None | str:
+        """Agrega varios logs (cualquier iterable) y actualiza los índices una sola vez."""
+        if nuevos_logs is self.logs:  # iterar los propios logs mientras crecen no terminaría nunca: se usa una copia
+            nuevos_logs = list(nuevos_logs)
+        self._sincronizar()
+        for log in nuevos_logs:
+            if not isinstance(log, dict) or not {"timestamp", "nivel", "mensaje", "usuario"} <= log.keys():
+                self._sincronizar(ingesta=True)
+                return "every log must be a dict with timestamp, nivel, mensaje and usuario"
+            self.logs.append(log)
+            if self.acotado:  # contar cada log antes de que el buffer lo descarte
+                self._sincronizar(ingesta=True)
+        self._sincronizar(ingesta=True)
+
+    def _en_paralelo(self, clase_acumulador, workers: int, nombres_usuarios: list | None = None):
+        """Divide los logs en `workers` rangos, cada proceso acumula uno y aquí se fusionan en orden.
+        Con fork (Linux) los workers heredan self.logs y solo reciben (inicio, fin): el proceso padre no recorre
+        ni copia los logs antes de repartirlos. Sin fork los shards viajan como columnas (timestamps, niveles,
+        usuarios): en modo columnar son arrays (se copian como bytes); en modo dict solo esos tres campos.
+        nombres_usuarios viaja una vez por worker (initializer), no una vez por shard."""
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        self.pasadas += 1
+        tamano = max(1, -(-len(self.logs) // workers))  # división hacia arriba
+        inicios = list(range(0, len(self.logs), tamano))
+        fines = [min(i + tamano, len(self.logs)) for i in inicios]
+        metodo = multiprocessing.get_start_method(allow_none=True) or multiprocessing.get_all_start_methods()[0]
+        if workers == 1:
+            parciales = [_acumular(clase_acumulador, 0, _filas_rango(self.logs, 0, len(self.logs)), nombres_usuarios)]
+        elif metodo == "fork":
+            # con fork los initargs no se serializan: cada worker hereda la referencia a self.logs
+            with ProcessPoolExecutor(max_workers=workers, initializer=_preparar_worker,
+                                     initargs=(self.logs, nombres_usuarios)) as executor:
+                parciales = list(executor.map(_acumular_rango, [clase_acumulador] * len(inicios), inicios, fines))
+        else:
+            shards = [tuple(map(list, zip(*_filas_rango(self.logs, i, j)))) for i, j in zip(inicios, fines)]
+            with ProcessPoolExecutor(max_workers=workers, initializer=_preparar_worker,
+                                     initargs=(None, nombres_usuarios)) as executor:
+                parciales = list(executor.map(_acumular_shard, [clase_acumulador] * len(shards), inicios, shards))
+        total = parciales[0]
+        for parcial in parciales[1:]:
+            total.fusionar(parcial)
+        return total
+
+    def _una_pasada(self, acumuladores: list) -> list:
+        """Recorre los logs una sola vez alimentando todos los acumuladores, retorna sus resultados."""
+        self.pasadas += 1
+        agregadores = [acumulador.agregar for acumulador in acumuladores]
+        if self.columnar:
+            filas = zip(range(len(self.logs)), self.logs.timestamps, self.logs.niveles, self.logs.usuarios)
+        else:
+            filas = ((i, log["timestamp"], log["nivel"], log["usuario"]) for i, log in enumerate(self.logs))
+        for i, ts, nivel, usuario in filas:
+            for agregar in agregadores:
+                agregar(i, ts, nivel, usuario)
+        if self.columnar:
+            return [a.resultado(self.logs, self.logs.tabla_niveles, self.logs.tabla_usuarios) for a in acumuladores]
+        return [a.resultado(self.logs) for a in acumuladores]
+
     def filtrar_por_nivel(self, nivel: str) -> list[dict] | str:
-        """ Filtra logs por nivel.Usa list comprehension."""
+        """ Filtra logs por nivel. Usa el índice de niveles: O(tamaño del resultado)."""
         if not isinstance(nivel, str):
             return "nivel must be a string"
         elif nivel.upper() not in {"INFO", "ERROR", "WARNING"}:
             return f"nivel must be one of INFO, ERROR, WARNING. Received: {nivel}"
         elif not self.logs:
             return "No logs to filter"
+        elif self.acotado:  # el buffer tiene a lo sumo `capacidad` logs: recorrerlo es O(capacidad)
+            return self._una_pasada([AcumuladorFiltroNivel(nivel)])[0]
         else:
-            return [log for log in self.logs if log["nivel"] == nivel]
+            self._sincronizar()
+            clave = self.logs.codigos_niveles.get(nivel) if self.columnar else nivel
+            return [self.logs[i] for i in self.indice_niveles.posiciones(clave)]
         
     
-    def ultimos_n_logs(self, n: int) -> list[dict]:
-        """ Retorna últimos n logs usando slicing."""
+    def ultimos_n_logs(self, n: int) -> list[dict] | VistaBuffer | str:
+        """ Retorna últimos n logs usando slicing.
+        Con capacidad retorna una VistaBuffer: no copia el buffer y deja de ser válida con el próximo append."""
         if not isinstance(n, int) or n < 0:
             return "n must be a non-negative integer"
         elif not n:
             return []
         elif not self.logs:
             return "No logs available"
+        elif self.acotado:
+            return self.logs.ultimos(n)
         else:
             return self.logs[-n:] # si n es mayor a la longitud de logs, retornará todos los logs 
     
     def logs_en_rango(self, inicio: int, fin: int) -> list[dict]:
-        """ Retorna logs entre timestamps inicio y fin. Asume logs ordenados por timestamp."""
+        """ Retorna logs entre timestamps inicio y fin, ordenados por timestamp.
+        Usa IndiceTimestamps: O(log n) para encontrar el rango + el tamaño del resultado."""
         if not isinstance(inicio, int) or not isinstance(fin, int):
             return "inicio and fin must be integers"
         elif inicio > fin:
             return "inicio must be less than or equal to fin"
         elif not self.logs:
             return "No logs available"
+        elif self.acotado:
+            return self._una_pasada([AcumuladorRango(inicio, fin)])[0]
         else:
-            return [log for log in self.logs if inicio <= log["timestamp"] <= fin]
+            self._sincronizar()
+            lo, hi = self.indice_ts.rango(inicio, fin)
+            if self.indice_ts.ids is None:  # logs en orden: el rango es un slice
+                return self.logs[lo:hi]
+            return [self.logs[i] for i in self.indice_ts.ids[lo:hi]]
     
-    def agrupar_por_usuario(self) -> dict[str, list[dict]]:
-        """ Agrupa logs por usuario.Retorna: {usuario: [logs_del_usuario]}"""
-        if not self.logs:
+    def agrupar_por_usuario(self, workers: int = 1) -> dict[str, list[dict]]:
+        """ Agrupa logs por usuario.Retorna: {usuario: [logs_del_usuario]}
+        Usa el índice de usuarios, no recorre los logs. Con workers > 1 lo recalcula en paralelo por shards."""
+        if not isinstance(workers, int) or workers < 1:
+            return "workers must be a positive integer"
+        elif not self.logs:
             return "No logs available"
+        elif workers > 1:
+            nombres = self.logs.tabla_usuarios if self.columnar else None
+            return self._en_paralelo(AcumuladorUsuarios, workers).resultado(self.logs, None, nombres)
+        elif self.acotado:
+            return self._una_pasada([AcumuladorUsuarios()])[0]
         else:
-            resultado = {}
-            for log in self.logs:
-                usuario = log["usuario"]
-                if usuario not in resultado:
-                    resultado[usuario] = []
-                resultado[usuario].append(log)
-            return resultado
+            self._sincronizar()
+            nombres = self.logs.tabla_usuarios if self.columnar else None
+            return {
+                usuario if nombres is None else nombres[usuario]: [self.logs[i] for i in ids]
+                for usuario, ids in self.indice_usuarios.ids.items()
+            }
     
     
-    def estadisticas_por_nivel(self) -> dict[str, dict]:
+    def estadisticas_por_nivel(self, workers: int = 1) -> dict[str, dict]:
         """Calcula estadísticas por nivel.
-        Retorna: { "INFO": {"cantidad": int, "usuarios_unicos": set, "primero": timestamp, "ultimo": timestamp}, "ERROR": {...},}"""
-        if not self.logs:
+        Retorna: { "INFO": {"cantidad": int, "usuarios_unicos": set, "primero": timestamp, "ultimo": timestamp}, "ERROR": {...},}
+        Los contadores se actualizan al llegar cada log, aquí solo se copian. Con workers > 1 se recalculan en paralelo por shards.
+        Con capacidad los contadores incluyen los logs que el buffer ya descartó (workers > 1 solo ve el buffer)."""
+        if not isinstance(workers, int) or workers < 1:
+            return "workers must be a positive integer"
+        elif not self.logs:
             return "No logs available"
+        elif workers > 1:
+            from functools import partial
+            # la tabla de nombres solo hace falta si los usuarios únicos van a un HyperLogLog
+            nombres = self.logs.tabla_usuarios if self.columnar and self.error_usuarios is not None else None
+            stats = self._en_paralelo(partial(AcumuladorNiveles, self.error_usuarios), workers, nombres)
+            if self.columnar:
+                return stats.resultado(self.logs, self.logs.tabla_niveles, self.logs.tabla_usuarios)
+            return stats.resultado(self.logs)
         else:
-            resultado = {}
-            for log in self.logs:
-                nivel = log["nivel"]
-                if nivel not in resultado:
-                    resultado[nivel] = {"cantidad": 0, "usuarios_unicos": set(), "primero": log["timestamp"], "ultimo": log["timestamp"]}
-                resultado[nivel]["cantidad"] += 1
-                resultado[nivel]["usuarios_unicos"].add(log["usuario"])
-                resultado[nivel]["primero"] = min(resultado[nivel]["primero"], log["timestamp"])
-                resultado[nivel]["ultimo"] = max(resultado[nivel]["ultimo"], log["timestamp"])
-            return resultado
+            self._sincronizar()
+            if self.columnar:
+                return self.stats_niveles.resultado(self.logs, self.logs.tabla_niveles, self.logs.tabla_usuarios)
+            # copia para que quien reciba el resultado no modifique los contadores internos
+            return {
+                nivel: {**stats, "usuarios_unicos": stats["usuarios_unicos"].copy()}
+                for nivel, stats in self.stats_niveles.resultado(self.logs).items()
+            }
     
+    # Planificador de consultas compuestas: cada condición sabe cuántas filas tiene en su índice (len de las
+    # posiciones o hi - lo del rango). Se empieza por la más selectiva y las demás se verifican solo sobre esas
+    # posiciones, los dicts se crean al final solo para el resultado.
+    def _condiciones(self, nivel, usuario, inicio, fin) -> list[dict]:
+        """Condiciones de la consulta con sus filas estimadas, de la más selectiva a la menos."""
+        condiciones = []
+        if self.acotado:  # sin índices: todas las condiciones se verifican sobre el buffer
+            logs_buffer = self.logs
+            if nivel is not None:
+                condiciones.append({"indice": "nivel", "contiene": lambda i: logs_buffer[i]["nivel"] == nivel})
+            if usuario is not None:
+                condiciones.append({"indice": "usuario", "contiene": lambda i: logs_buffer[i]["usuario"] == usuario})
+            if inicio is not None or fin is not None:
+                desde = -2**63 if inicio is None else inicio
+                hasta = 2**63 - 1 if fin is None else fin
+                condiciones.append({"indice": "rango", "contiene": lambda i: desde <= logs_buffer[i]["timestamp"] <= hasta})
+            for condicion in condiciones:
+                condicion["filas"] = len(self.logs)
+            return condiciones
+
+        self._sincronizar()
+        if self.columnar:
+            niveles, usuarios, timestamps = self.logs.niveles, self.logs.usuarios, self.logs.timestamps
+        else:
+            niveles = usuarios = timestamps = None
+        logs_lista = self.logs
+        if nivel is not None:
+            clave_nivel = self.logs.codigos_niveles.get(nivel) if self.columnar else nivel
+            posiciones = self.indice_niveles.posiciones(clave_nivel)
+            contiene = (lambda i: niveles[i] == clave_nivel) if self.columnar else (lambda i: logs_lista[i]["nivel"] == clave_nivel)
+            condiciones.append({"indice": "nivel", "filas": len(posiciones), "posiciones": posiciones, "contiene": contiene})
+        if usuario is not None:
+            clave_usuario = self.logs.codigos_usuarios.get(usuario) if self.columnar else usuario
+            posiciones = self.indice_usuarios.posiciones(clave_usuario)
+            contiene = (lambda i: usuarios[i] == clave_usuario) if self.columnar else (lambda i: logs_lista[i]["usuario"] == clave_usuario)
+            condiciones.append({"indice": "usuario", "filas": len(posiciones), "posiciones": posiciones, "contiene": contiene})
+        if inicio is not None or fin is not None:
+            desde = -2**63 if inicio is None else inicio
+            hasta = 2**63 - 1 if fin is None else fin
+            lo, hi = self.indice_ts.rango(desde, hasta)
+            posiciones = range(lo, hi) if self.indice_ts.ids is None else self.indice_ts.ids[lo:hi]
+            if self.columnar:
+                contiene = lambda i: desde <= timestamps[i] <= hasta
+            else:
+                contiene = lambda i: desde <= logs_lista[i]["timestamp"] <= hasta
+            condiciones.append({"indice": "rango", "filas": hi - lo, "posiciones": posiciones, "contiene": contiene})
+        condiciones.sort(key=lambda condicion: condicion["filas"])
+        return condiciones
+
+    @staticmethod
+    def _validar_query(nivel, usuario, inicio, fin) -> str | None:
+        if nivel is not None and not isinstance(nivel, str):
+            return "nivel must be a string"
+        elif usuario is not None and not isinstance(usuario, str):
+            return "usuario must be a string"
+        elif any(valor is not None and not isinstance(valor, int) for valor in (inicio, fin)):
+            return "inicio and fin must be integers"
+        elif inicio is not None and fin is not None and inicio > fin:
+            return "inicio must be less than or equal to fin"
+        return None
+
+    def explain(self, nivel: str | None = None, usuario: str | None = None, inicio: int | None = None, fin: int | None = None) -> dict | str:
+        """Plan que usaría query(): índice inicial, filas que se recorren y condiciones que se verifican después."""
+        error = self._validar_query(nivel, usuario, inicio, fin)
+        if error:
+            return error
+        condiciones = self._condiciones(nivel, usuario, inicio, fin)
+        if self.acotado or not condiciones:
+            inicial, filas = "scan", len(self.logs)
+            filtros = [condicion["indice"] for condicion in condiciones]
+        else:
+            inicial, filas = condiciones[0]["indice"], condiciones[0]["filas"]
+            filtros = [condicion["indice"] for condicion in condiciones[1:]]
+        return {
+            "indice": inicial,
+            "filas_escaneadas": filas,
+            "filtros": filtros,
+            "estimaciones": {condicion["indice"]: condicion["filas"] for condicion in condiciones},
+            "total_logs": len(self.logs),
+        }
+
+    def query(self, nivel: str | None = None, usuario: str | None = None, inicio: int | None = None, fin: int | None = None) -> list[dict] | str:
+        """Logs que cumplen TODAS las condiciones dadas, ordenados por timestamp.
+        Ej: query(nivel="ERROR", usuario="user2", inicio=1000, fin=1003). Ver explain() para el plan."""
+        error = self._validar_query(nivel, usuario, inicio, fin)
+        if error:
+            return error
+        elif not self.logs:
+            return "No logs available"
+        condiciones = self._condiciones(nivel, usuario, inicio, fin)
+        if self.acotado or not condiciones:
+            candidatos, filtros = range(len(self.logs)), condiciones
+        else:
+            candidatos, filtros = condiciones[0]["posiciones"], condiciones[1:]
+        for condicion in filtros:
+            contiene = condicion["contiene"]
+            candidatos = [i for i in candidatos if contiene(i)]
+        resultado = [self.logs[i] for i in candidatos]
+        # el índice de rango ya entrega orden por timestamp; los otros entregan orden de llegada
+        llegada_ordenada = not self.acotado and self.indice_ts.ids is None and self.indice_ts.ordenado
+        if not llegada_ordenada and (self.acotado or not condiciones or condiciones[0]["indice"] != "rango"):
+            resultado.sort(key=lambda log: log["timestamp"])
+        return resultado
+
+    def _top(self, frecuentes: SpaceSaving, k: int, nombres: list) -> list[tuple] | str:
+        if not isinstance(k, int) or k < 1:
+            return "k must be a positive integer"
+        elif k > self.capacidad_top:
+            return f"k must be <= capacidad_top ({self.capacidad_top})"
+        elif not self.logs:
+            return "No logs available"
+        self._sincronizar()
+        if self.columnar:
+            return [(nombres[codigo], conteo, error) for codigo, conteo, error in frecuentes.top(k)]
+        return frecuentes.top(k)
+
+    def top_mensajes(self, k: int) -> list[tuple] | str:
+        """Los k mensajes más frecuentes: [(mensaje, conteo, error)], el conteo real está entre conteo - error y conteo.
+        Se actualiza al llegar cada log, la consulta no recorre los logs. k debe ser <= capacidad_top."""
+        return self._top(self.frecuentes_mensajes, k, self.logs.tabla_mensajes if self.columnar else None)
+
+    def top_usuarios(self, k: int) -> list[tuple] | str:
+        """Los k usuarios con más logs: [(usuario, conteo, error)]."""
+        return self._top(self.frecuentes_usuarios, k, self.logs.tabla_usuarios if self.columnar else None)
+
     def resumen_completo(self) -> dict:
-        """Genera resumen completo de logs """
+        """Genera resumen completo de logs.
+        Con índices cada sección sale de los índices que se actualizan al llegar cada log: la primera llamada los
+        construye en UNA pasada y las siguientes no recorren los logs (solo arman el resultado).
+        Con capacidad no hay índices por posición: las secciones de logs se calculan en UNA pasada sobre el buffer,
+        cada sección es un acumulador; por_nivel sale de los contadores, que incluyen los logs ya descartados."""
         if not self.logs:
             return "No logs available"
-        else:
+        elif not self.acotado:
+            self._sincronizar()
             return {
                 "total_logs": len(self.logs),
                 "por_nivel": self.estadisticas_por_nivel(),
@@ -488,10 +1866,177 @@ class ProcesadorLogs:
                 "ultimos 5 logs": self.ultimos_n_logs(5),
                 "logs ERROR": self.filtrar_por_nivel("ERROR"),
             }
+        nivel_error = self.logs.codigos_niveles.get("ERROR", -1) if self.columnar else "ERROR"
+        por_usuario, en_rango, errores = self._una_pasada([
+            AcumuladorUsuarios(), AcumuladorRango(1000, 1003), AcumuladorFiltroNivel(nivel_error),
+        ])
+        return {
+            "total_logs": len(self.logs),
+            "por_nivel": self.estadisticas_por_nivel(),
+            "por_usuario": por_usuario,
+            "logs en rango 1000-1003": en_rango,
+            "ultimos 5 logs": list(self.ultimos_n_logs(5)),  # copia de 5: la vista cambia con el próximo append
+            "logs ERROR": errores,
+        }
+
+    def resumen_completo_v1(self) -> dict:
+        """Genera resumen completo de logs llamando a cada método (una pasada por sección)."""
+        if not self.logs:
+            return "No logs available"
+        else:
+            return {
+                "total_logs": len(self.logs),
+                "por_nivel": self.estadisticas_por_nivel(),
+                "por_usuario": self.agrupar_por_usuario(),
+                "logs en rango 1000-1003": self.logs_en_rango(1000, 1003),
+                "ultimos 5 logs": list(self.ultimos_n_logs(5)),
+                "logs ERROR": self.filtrar_por_nivel("ERROR"),
+            }
             
 
-data = ProcesadorLogs(logs)
-print(data.resumen_completo())
+# Benchmark: resumen en una pasada vs resumen_completo_v1 (una pasada por sección)
+def iterar_logs_generados(n: int):
+    """Genera n logs distintos ordenados por timestamp para los benchmarks, uno por uno."""
+    niveles = ["INFO", "ERROR", "WARNING"]
+    mensajes = ["Servidor iniciado", "Fallo en DB", "Request procesado", "Memoria alta", "Timeout"]
+    usuarios = ["system", "admin"] + [f"user{i}" for i in range(1000)]
+    for i in range(n):
+        yield {"timestamp": 1000 + i, "nivel": niveles[i % 3], "mensaje": mensajes[i % 5], "usuario": usuarios[(i * 7) % len(usuarios)]}
+
+def generar_logs(n: int) -> list[dict]:
+    return list(iterar_logs_generados(n))
+
+def benchmark_resumen(tamanos: tuple = (1_000_000, 10_000_000)) -> None:
+    """Sin índices (capacidad=n: el buffer guarda todo) v1 recorre los logs una vez por sección y resumen_completo
+    una sola vez. Con índices se separa la construcción (primera llamada) de las consultas siguientes."""
+    import time
+    for n in tamanos:
+        logs_bench = generar_logs(n)
+        partes = []
+        for nombre, metodo in (("v1", "resumen_completo_v1"), ("una pasada", "resumen_completo")):
+            procesador = ProcesadorLogs(logs_bench, capacidad=n)
+            inicio = time.perf_counter()
+            getattr(procesador, metodo)()
+            partes.append(f"{nombre}: {procesador.pasadas} pasadas, {time.perf_counter() - inicio:.3f} s")
+        procesador = ProcesadorLogs(logs_bench)
+        inicio = time.perf_counter()
+        procesador.resumen_completo()
+        construccion, pasadas = time.perf_counter() - inicio, procesador.pasadas
+        inicio = time.perf_counter()
+        procesador.resumen_completo()
+        consulta = time.perf_counter() - inicio
+        print(f"{n} logs -> sin índices: " + " | ".join(partes) +
+              f" || con índices: construcción {pasadas} pasadas, {construccion:.3f} s | "
+              f"consulta {procesador.pasadas - pasadas} pasadas, {consulta:.3f} s")
+
+# Benchmark: archivo JSON lines cargado a una lista vs streaming con mmap
+# El pico de memoria es el RSS máximo del proceso (VmHWM / ru_maxrss): incluye las páginas del archivo mapeadas con mmap
+# y la memoria de los objetos, que tracemalloc no ve completa. Como el pico nunca baja, cada camino corre en
+# un proceso nuevo; el camino "base" (solo cargar este archivo) da el piso que se resta a los demás.
+def _camino_jsonl(nombre: str, ruta: str) -> tuple[float, int]:
+    """Ejecuta un camino de benchmark_jsonl y retorna (segundos, pico de RSS en bytes) del proceso actual."""
+    import json
+    import resource
+    import sys
+    import time
+
+    inicio = time.perf_counter()
+    if nombre == "lista":
+        with open(ruta, encoding="utf-8") as archivo:
+            lista = [json.loads(linea) for linea in archivo]
+        ProcesadorLogs(lista).estadisticas_por_nivel()
+    elif nombre == "mmap columnar":
+        ProcesadorLogs.desde_jsonl(ruta).estadisticas_por_nivel()
+    elif nombre == "mmap solo estadisticas":
+        estadisticas_jsonl(ruta)
+    tiempo = time.perf_counter() - inicio
+    # En Linux ru_maxrss se hereda del padre a través de fork/exec (un padre grande lo infla); VmHWM es el pico
+    # del proceso actual. Sin /proc se usa ru_maxrss (KB en Linux, bytes en macOS).
+    try:
+        with open("/proc/self/status", encoding="ascii") as status:
+            for linea in status:
+                if linea.startswith("VmHWM:"):
+                    return tiempo, int(linea.split()[1]) * 1024
+    except OSError:
+        pass
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return tiempo, pico if sys.platform == "darwin" else pico * 1024
+
+
+def benchmark_jsonl(tamanos: tuple = (1_000_000, 10_000_000)) -> None:
+    import json
+    import os
+    import subprocess
+    import sys
+    import tempfile
+
+    # run_path no ejecuta los bloques __main__ del archivo, la última línea impresa es el resultado
+    script = ("import runpy, sys; m = runpy.run_path(sys.argv[1]); "
+              "print(*m['_camino_jsonl'](sys.argv[2], sys.argv[3]))")
+
+    def medir(nombre, ruta):
+        salida = subprocess.run([sys.executable, "-c", script, os.path.abspath(__file__), nombre, ruta],
+                                capture_output=True, text=True, check=True).stdout
+        tiempo, pico = salida.split("\n")[-2].split()
+        return float(tiempo), int(pico)
+
+    caminos = ("lista", "mmap columnar", "mmap solo estadisticas")
+    for n in tamanos:
+        with tempfile.NamedTemporaryFile("w", suffix=".jsonl", delete=False, encoding="utf-8") as archivo:
+            for log in iterar_logs_generados(n):
+                archivo.write(json.dumps(log) + "\n")
+            ruta = archivo.name
+        try:
+            base = medir("base", ruta)[1]
+            print(f"{n} logs | base (intérprete + módulo): pico RSS {base / 1024 / 1024:.1f} MB")
+            for nombre in caminos:
+                tiempo, pico = medir(nombre, ruta)
+                print(f"{n} logs | {nombre}: {n / tiempo:,.0f} logs/s, pico RSS {pico / 1024 / 1024:.1f} MB "
+                      f"(+{(pico - base) / 1024 / 1024:.1f} MB sobre la base)")
+        finally:
+            os.remove(ruta)
+
+# Benchmark: estadisticas_por_nivel y agrupar_por_usuario en paralelo por shards, en modo dict y columnar.
+# El speedup se mide contra la ruta serial real: un procesador nuevo, que construye sus índices en la primera consulta.
+def benchmark_paralelo(n: int = 10_000_000, workers: tuple = (1, 2, 4, 8, 16, 32)) -> None:
+    import time
+    logs = list(iterar_logs_generados(n))
+    for columnar in (False, True):
+        procesador = ProcesadorLogs(logs, columnar=columnar)
+        for consulta in ("estadisticas_por_nivel", "agrupar_por_usuario"):
+            # cada consulta serial en un procesador nuevo: la otra ya habría construido los índices
+            nuevo = ProcesadorLogs(logs, columnar=columnar)
+            inicio = time.perf_counter()
+            serial = getattr(nuevo, consulta)()
+            tiempo_serial = time.perf_counter() - inicio
+            del nuevo
+            print(f"{n} logs | columnar={columnar} | {consulta} serial: {tiempo_serial:.3f} s")
+            for w in workers:
+                if w == 1:
+                    continue
+                inicio = time.perf_counter()
+                resultado = getattr(procesador, consulta)(workers=w)
+                tiempo = time.perf_counter() - inicio
+                assert resultado == serial, "El resultado paralelo no coincide con el serial"
+                print(f"{n} logs | columnar={columnar} | {consulta} {w} procesos: {tiempo:.3f} s, "
+                      f"speedup {tiempo_serial / tiempo:.2f}x")
+            del serial
+
+# Benchmark: usuarios_unicos exacto (set) vs HyperLogLog, memoria y error observado
+def benchmark_hll(cantidades: tuple = (10_000, 1_000_000, 10_000_000), error: float = 0.01) -> None:
+    import tracemalloc
+    for n in cantidades:
+        tracemalloc.start()
+        exacto = {f"user{i}" for i in range(n)}
+        memoria_set = tracemalloc.get_traced_memory()[0]  # set + strings de los nombres
+        tracemalloc.stop()
+        sketch = HyperLogLog(error)
+        for i in range(n):
+            sketch.add(f"user{i}")
+        observado = abs(len(sketch) - len(exacto)) / len(exacto)
+        print(f"{n} usuarios | set: {memoria_set / 1024:,.0f} KB | HyperLogLog: {len(sketch.registros) / 1024:,.0f} KB, "
+              f"error observado {observado:.2%} (objetivo ~{error:.0%})")
+        del exacto
 
 # 📖 Ejercicios de Lectura de Código
 
@@ -563,6 +2108,191 @@ def eliminar_duplicados_v2(lista):
             vistos.add(item)
     return resultado
 
+# Versión externa para datos más grandes que la RAM (ej. exportaciones de ids de clientes, una línea por id).
+# En lugar de una lista + set con todo, se trabaja por bloques que caben en memoria_max (bytes, estimado)
+# y lo que no cabe se vuelca a archivos temporales que luego se leen de a una línea.
+# Cada archivo abierto también ocupa memoria_max. Medido con tracemalloc: leyendo en modo texto 15-20 KB (el buffer
+# _BUFFER_ARCHIVO + ~8 KB de texto decodificado + el bloque crudo que guarda para tell()). Escribiendo en modo texto
+# cada write queda como un str pendiente hasta juntar 8 KB (~30 KB con líneas cortas), por eso los archivos
+# temporales se escriben en binario (~5 KB).
+# Se reservan _BYTES_POR_ARCHIVO por archivo (con margen para la ruta, el heap y la línea en curso de cada run)
+# y la cantidad de archivos abiertos a la vez (particiones, runs por fusión) se limita a lo que cabe.
+_BUFFER_ARCHIVO = 4096
+_BYTES_POR_ARCHIVO = 24 * 1024
+
+def _bytes_estimados(item: str, extra: int) -> int:
+    return sys.getsizeof(item) + extra  # el string + su entrada en el set/dict
+
+def _archivos_permitidos(memoria_max: int, pedidos: int, reservados: int) -> int:
+    """Cuántos archivos se pueden abrir a la vez: los pedidos, sin pasar de memoria_max contando los reservados."""
+    permitidos = min(pedidos, memoria_max // _BYTES_POR_ARCHIVO - reservados)
+    if permitidos < 2:
+        raise ValueError(f"memoria_max must fit at least {2 + reservados} open files "
+                         f"({(2 + reservados) * _BYTES_POR_ARCHIVO} bytes), received: {memoria_max}")
+    return permitidos
+
+def _escribir_lineas(directorio: str, lineas) -> str:
+    import os
+    import tempfile
+    descriptor, ruta = tempfile.mkstemp(dir=directorio, suffix=".run")
+    with os.fdopen(descriptor, "wb", buffering=_BUFFER_ARCHIVO) as archivo:
+        for linea in lineas:
+            archivo.write(linea.encode("utf-8"))
+            archivo.write(b"\n")
+    return ruta
+
+def _fusionar_runs(runs: list[str], carpeta: str, max_archivos: int, key=None, unique: bool = False) -> list[str]:
+    """Fusiona los runs de a max_archivos (en varias pasadas) hasta que queden max_archivos o menos.
+    Cada pasada tiene abiertos max_archivos runs + el run de salida."""
+    import os
+    while len(runs) > max_archivos:
+        grupo, runs = runs[:max_archivos], runs[max_archivos:]
+        lineas = merge_sorted_files(grupo, key=key, unique=unique, buffering=_BUFFER_ARCHIVO)
+        runs.append(_escribir_lineas(carpeta, lineas))
+        for ruta in grupo:
+            os.remove(ruta)
+    return runs
+
+def eliminar_duplicados_externo(origen, memoria_max: int = 256 * 1024**2, directorio: str | None = None,
+                                max_archivos: int = 64):
+    """Genera los elementos únicos de origen (iterable de strings o archivo abierto) en orden ascendente.
+    Cada bloque que llena memoria_max se ordena y se guarda como un run; al final los runs se fusionan
+    con merge_sorted_files(unique=True). Nunca abre más de max_archivos runs a la vez, y menos si sus buffers
+    no caben en memoria_max (ValueError si no caben ni 2 runs + el run de salida)."""
+    import tempfile
+    if memoria_max <= 0 or max_archivos < 2:
+        raise ValueError("memoria_max must be positive and max_archivos at least 2")
+    max_archivos = _archivos_permitidos(memoria_max, max_archivos, 1)  # + el run que se escribe en cada pasada
+    memoria_max -= _BYTES_POR_ARCHIVO  # el bloque se ordena y se escribe con un archivo abierto
+    with tempfile.TemporaryDirectory(dir=directorio) as carpeta:
+        runs = []
+        bloque = set()
+        usados = 0
+        for item in origen:
+            item = item.rstrip("\n")
+            if item in bloque:
+                continue
+            bloque.add(item)
+            usados += _bytes_estimados(item, 80)  # + su entrada en el set y su puntero en sorted(bloque)
+            if usados >= memoria_max:
+                runs.append(_escribir_lineas(carpeta, sorted(bloque)))
+                bloque.clear()
+                usados = 0
+        if not runs:  # todo cupo en memoria: no hace falta tocar disco
+            yield from sorted(bloque)
+            return
+        if bloque:
+            runs.append(_escribir_lineas(carpeta, sorted(bloque)))
+        bloque = None
+        # fusión en varias pasadas si hay más runs que archivos abiertos permitidos
+        runs = _fusionar_runs(runs, carpeta, max_archivos, unique=True)
+        yield from merge_sorted_files(runs, unique=True, buffering=_BUFFER_ARCHIVO)
+
+def _primeros_de_particion(ruta: str, memoria_max: int, carpeta: str, particiones: int, nivel: int) -> list[str]:
+    """Deduplica una partición y la borra. Retorna runs con líneas "posición\telemento" de cada primera aparición,
+    ordenadas por posición. Si los distintos no caben en memoria_max, vuelve a particionar con otra semilla de hash
+    (particiones ya descuenta el archivo que se lee)."""
+    import os
+    primeros = {}
+    usados = leidos = 0
+    with open(ruta, encoding="utf-8", buffering=_BUFFER_ARCHIVO) as archivo:
+        for linea in archivo:
+            leidos += len(linea)
+            posicion, item = linea.rstrip("\n").split("\t", 1)
+            if item in primeros:
+                continue
+            primeros[item] = posicion  # el dict conserva el orden de inserción = orden de posición
+            usados += _bytes_estimados(item, 128) + sys.getsizeof(posicion)
+            if usados >= memoria_max and nivel < 8:
+                break
+        else:
+            os.remove(ruta)
+            return [_escribir_lineas(carpeta, (f"{posicion}\t{item}" for item, posicion in primeros.items()))]
+    primeros = archivo = None  # el archivo cerrado todavía guarda su último bloque leído
+    # lo leído hasta llenar memoria_max es lo que cabe en memoria: el archivo se reparte en partes de ese tamaño
+    sub_particiones = min(particiones, max(2, os.path.getsize(ruta) // leidos + 1))
+    rutas = _particionar(_lineas_de(ruta), carpeta, sub_particiones, nivel + 1)
+    os.remove(ruta)
+    runs = []
+    for sub_ruta in rutas:
+        runs.extend(_primeros_de_particion(sub_ruta, memoria_max, carpeta, particiones, nivel + 1))
+    return runs
+
+def _lineas_de(ruta: str):
+    with open(ruta, encoding="utf-8", buffering=_BUFFER_ARCHIVO) as archivo:
+        for linea in archivo:
+            posicion, item = linea.rstrip("\n").split("\t", 1)
+            yield int(posicion), item
+
+def _particionar(pares, carpeta: str, particiones: int, nivel: int) -> list[str]:
+    """Reparte (posición, elemento) en archivos según el hash del elemento: los duplicados caen juntos."""
+    import os
+    import tempfile
+    from contextlib import ExitStack
+    rutas = []
+    with ExitStack() as stack:
+        archivos = []
+        for _ in range(particiones):
+            descriptor, ruta = tempfile.mkstemp(dir=carpeta, suffix=".part")
+            rutas.append(ruta)
+            archivos.append(stack.enter_context(os.fdopen(descriptor, "wb", buffering=_BUFFER_ARCHIVO)))
+        for posicion, item in pares:
+            archivos[hash((nivel, item)) % particiones].write(f"{posicion}\t{item}\n".encode("utf-8"))
+    return rutas
+
+def eliminar_duplicados_externo_ordenado(origen, memoria_max: int = 256 * 1024**2, directorio: str | None = None,
+                                         particiones: int = 64):
+    """Como eliminar_duplicados_v2 (conserva el orden de primera aparición) pero con memoria acotada.
+    1) Particiona por hash del elemento a archivos temporales, guardando la posición original.
+    2) Cada partición se deduplica en memoria (dict elemento -> primera posición) y se guarda ordenada por posición.
+    3) Se fusionan las particiones por posición con merge_sorted_files (en varias pasadas si son muchas).
+    memoria_max incluye los buffers de los archivos abiertos: particiones se reduce a las que caben
+    (ValueError si no caben ni 2 + el archivo que se lee)."""
+    import tempfile
+    if memoria_max <= 0 or particiones < 2:
+        raise ValueError("memoria_max must be positive and particiones at least 2")
+    # una partición que se re-particiona se lee mientras se escriben sus sub-particiones
+    particiones = _archivos_permitidos(memoria_max, particiones, 1)
+    memoria_datos = memoria_max - 2 * _BYTES_POR_ARCHIVO  # el dict convive con la partición leída y su run
+    por_posicion = lambda linea: int(linea.split("\t", 1)[0])
+    with tempfile.TemporaryDirectory(dir=directorio) as carpeta:
+        pares = ((posicion, item.rstrip("\n")) for posicion, item in enumerate(origen))
+        resultados = []
+        for ruta in _particionar(pares, carpeta, particiones, 0):
+            resultados.extend(_primeros_de_particion(ruta, memoria_datos, carpeta, particiones, 0))
+        resultados = _fusionar_runs(resultados, carpeta, particiones, key=por_posicion)
+        for linea in merge_sorted_files(resultados, key=por_posicion, buffering=_BUFFER_ARCHIVO):
+            yield linea.split("\t", 1)[1]
+
+def benchmark_duplicados_externo(n: int = 10_000_000, distintos: int = 2_000_000,
+                                 memoria_max: int = 64 * 1024**2) -> None:
+    """Compara tiempo y pico de memoria (tracemalloc) de la versión en memoria y las externas.
+    Las externas deben quedar dentro de memoria_max, buffers de archivos incluidos."""
+    import random
+    import time
+    import tracemalloc
+    ids = [f"cliente-{random.randrange(distintos):09d}" for _ in range(n)]
+    esperado = eliminar_duplicados_v2(ids)
+    for nombre, funcion in (("en memoria (v2)", eliminar_duplicados_v2),
+                            ("externo ordenado", lambda datos: eliminar_duplicados_externo(datos, memoria_max)),
+                            ("externo orden original",
+                             lambda datos: eliminar_duplicados_externo_ordenado(datos, memoria_max))):
+        list(funcion(iter(ids[:10])))  # carga los módulos que importa: no son parte del pico
+        tracemalloc.start()
+        base = tracemalloc.get_traced_memory()[0]
+        inicio = time.perf_counter()
+        unicos = 0
+        for _ in funcion(iter(ids)):
+            unicos += 1
+        tiempo = time.perf_counter() - inicio
+        pico = tracemalloc.get_traced_memory()[1] - base
+        tracemalloc.stop()
+        assert unicos == len(esperado), f"{nombre}: {unicos} únicos, se esperaban {len(esperado)}"
+        assert funcion is eliminar_duplicados_v2 or pico <= memoria_max, \
+            f"{nombre}: pico {pico} bytes supera memoria_max ({memoria_max})"
+        print(f"n={n} | {nombre}: {tiempo:.2f}s | pico {pico / 1024**2:.1f} MB "
+              f"(presupuesto {memoria_max / 1024**2:.1f} MB) | {unicos} únicos")
+
 # Código 2: Rotar lista
 def rotar_ineficiente(lista, k):
     """Crea muchas listas nuevas."""
@@ -570,12 +2300,8 @@ def rotar_ineficiente(lista, k):
     return lista[-k:] + lista[:-k]
 # Refactoriza para hacerlo in-place
 def rotar_eficiente(lista, k):
-    """O(n) tiempo, O(1) espacio."""
-    k = k % len(lista)
-    lista.reverse()
-    lista[:k] = lista[:k][::-1]
-    lista[k:] = lista[k:][::-1]
-    return lista
+    """O(n) tiempo, O(1) espacio: invierte por rangos intercambiando elementos, sin slices."""
+    return rotate_right(lista, k)
 
 # Código 3: Encontrar elementos comunes
 def elementos_comunes_v1(lista1, lista2):
@@ -614,6 +2340,179 @@ def particionar_v2(lista, pivote):
             mayores.append(x)
     return menores + iguales + mayores
 
+# Versión in-place (bandera holandesa de Dijkstra): una pasada y O(1) memoria extra en vez de 3 listas + concatenación.
+# Funciona en list y array.array. Retorna los límites (menor, mayor):
+# lista[inicio:menor] < pivote, lista[menor:mayor] == pivote, lista[mayor:fin] > pivote
+def particionar_inplace(lista, pivote, inicio=0, fin=None):
+    """O(n) - una pasada intercambiando elementos, sin listas nuevas."""
+    if fin is None:
+        fin = len(lista)
+    menor, actual, mayor = inicio, inicio, fin
+    while actual < mayor:
+        x = lista[actual]
+        if x < pivote:
+            lista[menor], lista[actual] = x, lista[menor]
+            menor += 1
+            actual += 1
+        elif x > pivote:
+            mayor -= 1
+            lista[actual], lista[mayor] = lista[mayor], x
+        else:
+            actual += 1
+    return menor, mayor
+
+# Quickselect: particiona alrededor de un pivote aleatorio y sigue solo por el lado donde cae k.
+# O(n) promedio en vez de O(n log n) de ordenar todo; la partición de 3 vías evita el peor caso con muchos repetidos.
+def seleccionar_k(lista, k):
+    """Retorna el k-ésimo menor (k desde 0). Reordena lista in-place: pasar una copia si se necesita el orden."""
+    import random
+    if not 0 <= k < len(lista):
+        return None
+    inicio, fin = 0, len(lista)
+    while True:
+        pivote = lista[random.randrange(inicio, fin)]
+        menor, mayor = particionar_inplace(lista, pivote, inicio, fin)
+        if k < menor:
+            fin = menor
+        elif k >= mayor:
+            inicio = mayor
+        else:
+            return pivote
+
+def mediana(lista):
+    """Mediana con quickselect (promedio de los dos centrales si la longitud es par). Reordena lista in-place."""
+    n = len(lista)
+    if not n:
+        return None
+    alto = seleccionar_k(lista, n // 2)
+    if n % 2:
+        return alto
+    # tras seleccionar, todo lo anterior a n // 2 es <= alto: el central bajo es el máximo de esa parte
+    bajo = max(lista[i] for i in range(n // 2))
+    return (bajo + alto) / 2
+
+def benchmark_seleccion(tamanos: tuple = (100_000, 1_000_000)) -> None:
+    """Quickselect vs ordenar y leer el índice central (lo que hace procesar_datos_3 en Day-10)."""
+    import random
+    import time
+    from array import array
+    for n in tamanos:
+        datos = [random.random() for _ in range(n)]
+        for nombre, crear in (("list", list), ("array('d')", lambda valores: array("d", valores))):
+            copia = crear(datos)
+            inicio = time.perf_counter()
+            valor = seleccionar_k(copia, n // 2)
+            tiempo_select = time.perf_counter() - inicio
+            copia = crear(datos)
+            inicio = time.perf_counter()
+            esperado = sorted(copia)[n // 2]
+            tiempo_sort = time.perf_counter() - inicio
+            assert valor == esperado, "quickselect no coincide con sorted()"
+            print(f"n={n} | {nombre} | quickselect: {tiempo_select * 1000:.1f} ms | "
+                  f"sorted + índice: {tiempo_sort * 1000:.1f} ms")
+
+
+# Demos y benchmarks: solo al ejecutar el archivo. Los procesos hijos de los modos paralelos pueden
+# volver a importarlo (spawn/forkserver) y así no relanzan cada demo ni su propio pool.
+if __name__ == "__main__":
+    print(list(merge_sorted_sources([1, 3, 5], [2, 4, 6], [0, 3, 9], unique=True)))
+    print(list(merge_sorted_sources(["b", "C", "d"], ["A", "c"], key=str.lower)))
+    benchmark_kway_merge(8, 5_000)
+
+    sumas = PairSumIndex([5, 2, 4, 3, 1, 10, 2, 3])
+    print(sumas.pairs(7), pairs_with_sum_hash([5, 2, 4, 3, 1, 10, 2, 3], 7))  # [(2, 5), (3, 4)]
+    print(sumas.three_sum(9), sumas.k_sum(4, 12))
+    benchmark_pair_sums(2_000, 50)
+
+    try:
+        print(batch_sales_windows([ventas_diarias, ventas_diarias[::-1]], 3))
+        benchmark_batch_windows(1_000)
+    except ImportError:
+        print("batch_sales_windows necesita numpy: pip install numpy")
+
+    try:
+        print(batch_min_windows(ventas_diarias, [500, 100, 1800, 10_000]))  # [3, 1, 12, 0]
+        benchmark_batch_min_windows(10_000, 100)
+    except ImportError:
+        print("batch_min_windows necesita numpy: pip install numpy")
+
+    print(list(stream_window_sums(iter(ventas_diarias), 3)))
+    print(list(stream_max_average(iter(ventas_diarias), 3))[-1] == max_average_window(ventas_diarias, 3))
+    print(list(stream_positive_windows((venta - 150 for venta in ventas_diarias), 3)))
+
+    print(sliding_window_max(ventas_diarias, 3))
+    print(sliding_window_min(ventas_diarias, 3))
+    print(sliding_window_median(ventas_diarias, 4))
+    print(sliding_window_percentile(ventas_diarias, 5, 90))
+    benchmark_sliding_extremes(2_000, (10, 100))
+
+    ventas_por_rango = FenwickTree(ventas_diarias)
+    print(PrefixSums(ventas_diarias).range_sum(2, 4), ventas_por_rango.range_sum(2, 4))  # 470 470
+    ventas_por_rango[3] = 200  # corrección del día 3
+    print(ventas_por_rango.range_sum(2, 4))  # 490
+    benchmark_range_sums(10_000, 1_000, 100)
+
+    print(rotate_right(bytearray(b"abcde"), 2), rotate_left(memoryview(bytearray(b"abcde")), 2).tobytes())
+    benchmark_in_place_rotation((1_000, 10_000))
+
+    data = ProcesadorLogs(logs)
+    print(data.resumen_completo())
+
+    # Mismo procesador en modo columnar: los resultados deben ser iguales
+    data_columnar = ProcesadorLogs(logs, columnar=True)
+    print(data_columnar.resumen_completo() == data.resumen_completo())
+    print(data.resumen_completo() == data.resumen_completo_v1())
+
+    benchmark_resumen((10_000,))
+
+    benchmark_jsonl((10_000,))
+
+    benchmark_hll((10_000,))
+
+    # Consulta compuesta: ERROR de user2 entre 1000 y 1004, empieza por el índice más selectivo
+    print(data.explain(nivel="ERROR", usuario="user2", inicio=1000, fin=1004))
+    print(len(data.query(nivel="ERROR", usuario="user2", inicio=1000, fin=1004)))
+
+    # Heavy hitters: mensajes más repetidos sin agrupar ni ordenar todos los logs
+    print(data.top_mensajes(2))
+    print(data_columnar.top_usuarios(3))
+    aproximado = ProcesadorLogs(logs, error_usuarios=0.01)
+    print(aproximado.estadisticas_por_nivel()["INFO"])
+
+    print(data.estadisticas_por_nivel(workers=2) == data.estadisticas_por_nivel())
+    print(data_columnar.agrupar_por_usuario(workers=2) == data.agrupar_por_usuario())
+    benchmark_paralelo(10_000, (1, 2))
+
+    # Logs que llegan fuera de orden: el índice se re-ordena en la siguiente consulta
+    data_desordenada = ProcesadorLogs(logs[:6])
+    data_desordenada.append({"timestamp": 999, "nivel": "INFO", "mensaje": "Log atrasado", "usuario": "system"})
+    print(data_desordenada.logs_en_rango(999, 1001))
+
+    # Ingestión incremental: append/extend actualizan los índices, las lecturas no recorren todos los logs
+    servicio_logs = ProcesadorLogs([])
+    servicio_logs.extend(logs[:6])
+    servicio_logs.append({"timestamp": 1006, "nivel": "ERROR", "mensaje": "Timeout", "usuario": "user1"})
+    print(servicio_logs.filtrar_por_nivel("ERROR"))
+    print(servicio_logs.estadisticas_por_nivel()["ERROR"])
+    print(servicio_logs.pasadas)  # 0: ninguna consulta recorrió todos los logs
+
+    # Modo acotado para live tailing: solo los últimos 10 logs en memoria, las estadísticas cuentan los 600
+    tail_logs = ProcesadorLogs(logs, capacidad=10)
+    print(tail_logs.ultimos_n_logs(3))
+    print(len(tail_logs.logs), tail_logs.logs.descartados, tail_logs.estadisticas_por_nivel()["INFO"]["cantidad"])
+
+    clientes = [f"c{i * 7919 % 3_000}" for i in range(12_000)]
+    unicos_clientes = list(eliminar_duplicados_externo(clientes, memoria_max=128 * 1024))  # varios runs en disco
+    print(unicos_clientes[:5], unicos_clientes == sorted(set(clientes)))
+    print(list(eliminar_duplicados_externo_ordenado(clientes, memoria_max=128 * 1024)) == eliminar_duplicados_v2(clientes))
+    benchmark_duplicados_externo(50_000, 10_000, 256 * 1024)
+
+    numeros = [3, 8, 5, 1, 5, 9, 2, 5]
+    print(particionar_inplace(numeros, 5), numeros)
+    print(seleccionar_k([7, 1, 9, 3, 5], 1), mediana([7, 1, 9, 3, 5]), mediana([4, 1, 3, 2]))
+    benchmark_seleccion((10_000,))
+
+
 # 🧪 Evaluación Teórica
 
 # Pregunta 1